@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2016 Antonino Ingargiola and contributors.
+#
+"""
+Compare pybroom's columnar extractors with the previous per-cell versions.
+
+The `legacy_*` functions below are copies of the pybroom 0.2 extractors,
+which allocate an object DataFrame, fill it with one `.loc` write per cell
+and then convert each column with `pd.to_numeric`.
+
+Run with::
+
+    python benchmarks/bench_columnar.py [num_results]
+"""
+import sys
+import os
+import timeit
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import lmfit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+import pybroom as br
+
+
+def _to_numeric_ignore(column):
+    # `pd.to_numeric(..., errors='ignore')` was removed in pandas 3
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column
+
+
+def legacy_tidy_lmfit_result(result):
+    params_attrs = ['name', 'value', 'min', 'max', 'vary', 'expr', 'stderr']
+    columns = params_attrs + ['init_value']
+    d = pd.DataFrame(index=range(result.nvarys), columns=columns)
+    for i, (name, param) in enumerate(sorted(result.params.items())):
+        for p in params_attrs:
+            d.loc[i, p] = getattr(param, p)
+        if name in result.init_values:
+            d.loc[i, 'init_value'] = result.init_values[name]
+    return d.apply(_to_numeric_ignore)
+
+
+def legacy_glance_lmfit_result(result):
+    result_attrs = ['name', 'method', 'nvarys', 'ndata', 'chisqr', 'redchi',
+                    'aic', 'bic', 'nfev', 'success', 'message']
+    attrs_map = OrderedDict((n, n) for n in result_attrs)
+    attrs_map['name'] = 'model'
+    attrs_map['aic'] = 'AIC'
+    attrs_map['bic'] = 'BIC'
+    attrs_map['nvarys'] = 'num_params'
+    attrs_map['nfev'] = 'num_func_eval'
+    attrs_map['ndata'] = 'num_data_points'
+    d = pd.DataFrame(index=range(1), columns=attrs_map.values())
+    d.loc[0, attrs_map.pop('name')] = result.model.name
+    for attr_name, df_name in attrs_map.items():
+        d.loc[0, df_name] = getattr(result, attr_name)
+    return d.apply(_to_numeric_ignore)
+
+
+def legacy_augment_lmfit_modelresult(result):
+    columns = ['x', 'data', 'best_fit', 'residual']
+    d = pd.DataFrame(index=range(result.ndata), columns=columns)
+    for col in columns[1:]:
+        d.loc[:, col] = getattr(result, col)
+    x_array = result.userkws[result.model.independent_vars[0]]
+    d.loc[:, 'x'] = x_array
+    if len(result.components) > 1:
+        for comp in result.components:
+            # Evaluate on a float array: the object column `d.x` breaks
+            # ufuncs such as `np.exp` in recent numpy versions.
+            d.loc[:, comp.name] = comp.eval(x=x_array, **result.values)
+    return d.apply(_to_numeric_ignore)
+
+
+def make_results(num_results, ndata=101, seed=1):
+    rng = np.random.RandomState(seed)
+    x = np.linspace(-10, 10, ndata)
+    model = (lmfit.models.GaussianModel(prefix='p1_') +
+             lmfit.models.GaussianModel(prefix='p2_'))
+    params = model.make_params(p1_amplitude=1, p1_center=-1, p1_sigma=1,
+                               p2_amplitude=1, p2_center=2, p2_sigma=1)
+    y = model.eval(params, x=x)
+    return [model.fit(y + rng.randn(ndata) * 0.02, params, x=x)
+            for _ in range(num_results)]
+
+
+def main(num_results=200, repeat=3):
+    results = make_results(num_results)
+    cases = [
+        ('tidy', legacy_tidy_lmfit_result, br.tidy_lmfit_result),
+        ('glance', legacy_glance_lmfit_result, br.glance_lmfit_result),
+        ('augment', legacy_augment_lmfit_modelresult,
+         br._augment_lmfit_modelresult),
+    ]
+    print('%d results, best of %d runs' % (num_results, repeat))
+    print('%-8s %12s %12s %9s' % ('function', 'legacy (s)', 'new (s)',
+                                   'speedup'))
+    for name, legacy, new in cases:
+        t_old = min(timeit.repeat(lambda: [legacy(r) for r in results],
+                                  number=1, repeat=repeat))
+        t_new = min(timeit.repeat(lambda: [new(r) for r in results],
+                                  number=1, repeat=repeat))
+        print('%-8s %12.4f %12.4f %8.1fx' % (name, t_old, t_new,
+                                              t_old / t_new))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
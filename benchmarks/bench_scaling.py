@@ -0,0 +1,245 @@
+#
+# Copyright (c) 2016 Antonino Ingargiola and contributors.
+#
+"""
+Scaling benchmarks for pybroom's `tidy`, `glance` and `augment`.
+
+Fit results are generated locally (no network or data files needed) and
+each pybroom function is timed while sweeping one of these parameters:
+
+- number of fit results in the input list,
+- nesting depth of the input (i.e. number of `var_names`),
+- number of fitted parameters,
+- number of data points (`ndata`),
+- number of model components.
+
+For each case the best time of several runs and the peak memory allocated
+(measured with `tracemalloc`) are saved in a JSON report. Two reports
+(e.g. before and after a pandas or lmfit upgrade) can be compared with
+the `--compare` option.
+
+Usage::
+
+    python benchmarks/bench_scaling.py -o report.json
+    python benchmarks/bench_scaling.py -o new.json --compare report.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import scipy
+import scipy.optimize as so
+import lmfit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+import pybroom as br
+
+
+def make_modelresult(num_components=2, ndata=101, seed=1):
+    """Return a `ModelResult` for a sum of `num_components` Gaussians.
+    """
+    rng = np.random.RandomState(seed)
+    x = np.linspace(-10, 10, ndata)
+    centers = np.linspace(-6, 6, num_components)
+    model = lmfit.models.GaussianModel(prefix='g0_')
+    for i in range(1, num_components):
+        model += lmfit.models.GaussianModel(prefix='g%d_' % i)
+    params = model.make_params()
+    for i, center in enumerate(centers):
+        params['g%d_center' % i].set(value=center)
+        params['g%d_sigma' % i].set(value=0.5, min=0)
+        params['g%d_amplitude' % i].set(value=1)
+    y = model.eval(params, x=x) + rng.randn(ndata) * 0.02
+    return model.fit(y, params, x=x)
+
+
+def make_minimizerresult(num_params=3, ndata=101, seed=1):
+    """Return a `MinimizerResult` for a polynomial with `num_params` coeffs.
+    """
+    rng = np.random.RandomState(seed)
+    x = np.linspace(-1, 1, ndata)
+    y = rng.randn(ndata)
+    params = lmfit.Parameters()
+    for i in range(num_params):
+        params.add('c%d' % i, value=0)
+
+    def residual(params):
+        coeffs = [params['c%d' % i].value for i in range(num_params)]
+        return np.polyval(coeffs, x) - y
+    return lmfit.minimize(residual, params)
+
+
+def make_optimizeresult(num_params=3, seed=1):
+    """Return a synthetic `OptimizeResult` as returned by `least_squares`.
+    """
+    rng = np.random.RandomState(seed)
+    return so.OptimizeResult(
+        x=rng.randn(num_params), grad=rng.randn(num_params) * 1e-8,
+        active_mask=np.zeros(num_params, dtype=int), cost=rng.rand(),
+        optimality=1e-9, nfev=20, njev=10, status=1, success=True,
+        message='`gtol` termination condition is satisfied.')
+
+
+def nest(results, depth):
+    """Arrange `results` in a `depth`-levels structure of dicts and lists.
+
+    The outer levels are dicts with 'k0', 'k1', ... keys, the inner
+    level is a list. `len(results)` should be a perfect power of `depth`.
+    """
+    if depth == 1:
+        return list(results)
+    size = int(round(len(results) ** (1 / depth)))
+    chunk = len(results) // size
+    return {'k%d' % i: nest(results[i * chunk:(i + 1) * chunk], depth - 1)
+            for i in range(size)}
+
+
+def measure(func, repeat):
+    """Return (best time in seconds, peak traced memory in bytes) of `func`.
+    """
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(times), peak
+
+
+def cases(quick=False):
+    """Generate benchmark cases as (description dict, callable) pairs.
+    """
+    sizes = [10, 100] if quick else [10, 100, 1000, 10000]
+    lmfit_funcs = [('tidy', br.tidy), ('glance', br.glance),
+                   ('augment', br.augment)]
+    modelresult = make_modelresult()
+    for n in sizes:
+        results = [modelresult] * n
+        for name, func in lmfit_funcs:
+            yield (dict(function=name, result_type='ModelResult',
+                        sweep='num_results', num_results=n),
+                   lambda func=func, results=results: func(results))
+    for n in sizes:
+        results = [make_optimizeresult()] * n
+        yield (dict(function='tidy', result_type='OptimizeResult',
+                    sweep='num_results', num_results=n),
+               lambda results=results: br.tidy(results, param_names='a b c'))
+        yield (dict(function='glance', result_type='OptimizeResult',
+                    sweep='num_results', num_results=n),
+               lambda results=results: br.glance(results))
+
+    num_leaves = 64 if quick else 4096
+    for depth in (1, 2, 3):
+        leaves = [modelresult] * num_leaves
+        results = nest(leaves, depth)
+        var_names = ['level%d' % i for i in range(depth)]
+        for name, func in lmfit_funcs:
+            yield (dict(function=name, result_type='ModelResult',
+                        sweep='depth', num_results=num_leaves, depth=depth),
+                   lambda func=func, results=results, var_names=var_names:
+                   func(results, var_names=var_names))
+
+    n = 10 if quick else 100
+    for num_params in ([2, 10] if quick else [2, 10, 50]):
+        results = [make_minimizerresult(num_params)] * n
+        for name, func in lmfit_funcs[:2]:
+            yield (dict(function=name, result_type='MinimizerResult',
+                        sweep='num_params', num_results=n,
+                        num_params=num_params),
+                   lambda func=func, results=results: func(results))
+
+    for ndata in ([100, 1000] if quick else [100, 1000, 10000, 100000]):
+        results = [make_modelresult(ndata=ndata)] * n
+        yield (dict(function='augment', result_type='ModelResult',
+                    sweep='ndata', num_results=n, ndata=ndata),
+               lambda results=results: br.augment(results))
+
+    for num_components in ([1, 3] if quick else [1, 3, 10]):
+        results = [make_modelresult(num_components)] * n
+        for name, func in lmfit_funcs:
+            yield (dict(function=name, result_type='ModelResult',
+                        sweep='num_components', num_results=n,
+                        num_components=num_components),
+                   lambda func=func, results=results: func(results))
+
+
+def run(quick=False, repeat=3):
+    """Run all the benchmarks and return the report as a dict.
+    """
+    report = dict(
+        created=datetime.datetime.now().isoformat(timespec='seconds'),
+        versions=dict(python=platform.python_version(),
+                      pybroom=br.__version__, pandas=pd.__version__,
+                      numpy=np.__version__, scipy=scipy.__version__,
+                      lmfit=lmfit.__version__),
+        platform=platform.platform(), quick=quick, repeat=repeat,
+        benchmarks=[])
+    for desc, func in cases(quick):
+        desc['time'], desc['peak_memory'] = measure(func, repeat)
+        report['benchmarks'].append(desc)
+        print('%-8s %-16s %s: %8.4f s %10.1f KiB' % (
+            desc['function'], desc['result_type'], _case_label(desc),
+            desc['time'], desc['peak_memory'] / 1024))
+    return report
+
+
+def _case_label(desc):
+    fields = ('sweep', 'num_results', 'depth', 'num_params', 'ndata',
+              'num_components')
+    return ' '.join('%s=%s' % (f, desc[f]) for f in fields if f in desc)
+
+
+def _case_key(desc):
+    return (desc['function'], desc['result_type'], _case_label(desc))
+
+
+def compare(report, baseline):
+    """Print the time and memory ratio of `report` vs `baseline`.
+    """
+    base = {_case_key(d): d for d in baseline['benchmarks']}
+    print('\nRatio vs baseline (%s, pandas %s, lmfit %s):' % (
+        baseline['created'], baseline['versions']['pandas'],
+        baseline['versions']['lmfit']))
+    for desc in report['benchmarks']:
+        ref = base.get(_case_key(desc))
+        if ref is None:
+            continue
+        print('%-8s %-16s %s: time x%.2f, memory x%.2f' % (
+            desc['function'], desc['result_type'], _case_label(desc),
+            desc['time'] / ref['time'],
+            desc['peak_memory'] / max(ref['peak_memory'], 1)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-o', '--output', help='path of the JSON report')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON report to compare with')
+    parser.add_argument('--quick', action='store_true',
+                        help='run only the smallest cases')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='number of timed runs for each case')
+    args = parser.parse_args(argv)
+    report = run(quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
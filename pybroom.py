@@ -81,7 +81,18 @@ Example:
 
 
 """
+import os
+import time
+import asyncio
+import inspect
+import weakref
+import threading
+import contextlib
+import warnings
+import operator
+import functools
 from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, Future, as_completed
 import numpy as np
 import pandas as pd
 import scipy.optimize as so
@@ -90,7 +101,8 @@ import lmfit
 __version__ = '0.3.dev0'
 
 
-def tidy(result, var_names='key', **kwargs):
+def tidy(result, var_names='key', n_jobs=None, executor=None, cache=None,
+         max_memory=None, spill_path=None, **kwargs):
     """Tidy DataFrame containing fitted parameter data from `result`.
 
     A function to tidy any of the supported fit result
@@ -112,6 +124,24 @@ def tidy(result, var_names='key', **kwargs):
             for fit results which don't include parameter's names
             (such as scipy's OptimizeResult). It can either be a list of
             strings or a single string with space-separated names.
+        n_jobs (int or None): number of worker processes used to tidy
+            the items of a list/dict input. Use -1 for one process per CPU.
+            If None or 1 (default), items are tidied serially.
+        executor (concurrent.futures.Executor or None): executor used
+            to tidy the items of a list/dict input (e.g. a
+            `ThreadPoolExecutor`). If passed, `n_jobs` is ignored.
+        cache (ResultCache or None): if not None, a :class:`ResultCache`
+            used to reuse DataFrames of fit results tidied in previous
+            calls. Used only when the input is a list/dict.
+        max_memory (int, string or None): memory budget for the returned
+            DataFrame, in bytes or as a string such as '2GB'. Used only
+            when the input is a list/dict. If the size estimated by
+            :func:`estimate_memory` is larger, instead of a DataFrame
+            return a generator of DataFrame chunks (as :func:`iter_tidy`)
+            or, when `spill_path` is not None, write the rows to a file.
+        spill_path (string or None): path of the file written when the
+            output is larger than `max_memory` (see :func:`write`). In
+            this case the path is returned.
         **kwargs: additional arguments passed to the underlying specialized
             tidying function.
 
@@ -129,22 +159,25 @@ def tidy(result, var_names='key', **kwargs):
         :func:`tidy_lmfit_result` and :func:`tidy_scipy_result`.
     """
     # Find out what result is and call the relevant function
-    if isinstance(result, so.OptimizeResult):
-        if 'param_names' not in kwargs:
-            msg = "The argument `param_names` is required for this input type."
-            raise ValueError(msg)
-        return tidy_scipy_result(result, **kwargs)
-    elif (isinstance(result, lmfit.model.ModelResult) or
-          isinstance(result, lmfit.minimizer.MinimizerResult)):
-        return tidy_lmfit_result(result)
-    elif isinstance(result, list) or isinstance(result, dict):
-        return _multi_dataframe(tidy, result, var_names, **kwargs)
+    handler = _profiled_call('dispatch', _find_handler, 'tidy', result)
+    if handler is not None:
+        return _profiled_call(('extract', 'tidy', type(result).__name__),
+                              handler, result, **kwargs)
+    elif _is_collection(result):
+        if max_memory is not None:
+            out = _budgeted_output('tidy', result, var_names, max_memory,
+                                   spill_path, kwargs)
+            if out is not None:
+                return out
+        return _multi_dataframe(tidy, result, var_names, n_jobs=n_jobs,
+                                executor=executor, cache=cache, **kwargs)
     else:
         msg = 'Sorry, `tidy` does not support this object type (%s)'
         raise NotImplementedError(msg % type(result))
 
 
-def glance(results, var_names='key', **kwargs):
+def glance(results, var_names='key', n_jobs=None, executor=None,
+           cache=None, max_memory=None, spill_path=None, **kwargs):
     """Tidy DataFrame containing fit summaries from`result`.
 
     A function to tidy any of the supported fit result
@@ -162,6 +195,24 @@ def glance(results, var_names='key', **kwargs):
         var_names (string or list): name(s) of the column(s) containing
             an "index" that is different for each element in the set of
             fit results.
+        n_jobs (int or None): number of worker processes used to tidy
+            the items of a list/dict input. Use -1 for one process per CPU.
+            If None or 1 (default), items are tidied serially.
+        executor (concurrent.futures.Executor or None): executor used
+            to tidy the items of a list/dict input (e.g. a
+            `ThreadPoolExecutor`). If passed, `n_jobs` is ignored.
+        cache (ResultCache or None): if not None, a :class:`ResultCache`
+            used to reuse DataFrames of fit results tidied in previous
+            calls. Used only when the input is a list/dict.
+        max_memory (int, string or None): memory budget for the returned
+            DataFrame, in bytes or as a string such as '2GB'. Used only
+            when the input is a list/dict. If the size estimated by
+            :func:`estimate_memory` is larger, instead of a DataFrame
+            return a generator of DataFrame chunks (as :func:`iter_glance`)
+            or, when `spill_path` is not None, write the rows to a file.
+        spill_path (string or None): path of the file written when the
+            output is larger than `max_memory` (see :func:`write`). In
+            this case the path is returned.
         **kwargs: additional arguments passed to the underlying specialized
             tidying function.
 
@@ -178,19 +229,26 @@ def glance(results, var_names='key', **kwargs):
         arguments refer to the specialized tidying functions:
         :func:`glance_lmfit_result` and :func:`glance_scipy_result`.
     """
-    if isinstance(results, so.OptimizeResult):
-        return glance_scipy_result(results, **kwargs)
-    elif (isinstance(results, lmfit.model.ModelResult) or
-          isinstance(results, lmfit.minimizer.MinimizerResult)):
-        return glance_lmfit_result(results)
-    elif isinstance(results, list) or isinstance(results, dict):
-        return _multi_dataframe(glance, results, var_names, **kwargs)
+    handler = _profiled_call('dispatch', _find_handler, 'glance', results)
+    if handler is not None:
+        return _profiled_call(('extract', 'glance', type(results).__name__),
+                              handler, results, **kwargs)
+    elif _is_collection(results):
+        if max_memory is not None:
+            out = _budgeted_output('glance', results, var_names, max_memory,
+                                   spill_path, kwargs)
+            if out is not None:
+                return out
+        return _multi_dataframe(glance, results, var_names, n_jobs=n_jobs,
+                                executor=executor, cache=cache, **kwargs)
     else:
         msg = 'Sorry, `glance` does not support this object type (%s)'
         raise NotImplementedError(msg % type(results))
 
 
-def augment(results, var_names='key', **kwargs):
+def augment(results, var_names='key', n_jobs=None, executor=None,
+            cache=None, precision=None, x_eval=None, max_memory=None,
+            spill_path=None, **kwargs):
     """Tidy DataFrame containing fit data from `result`.
 
     A function to tidy any of the supported fit result
@@ -208,6 +266,40 @@ def augment(results, var_names='key', **kwargs):
         var_names (string or list): name(s) of the column(s) containing
             an "index" that is different for each element in the set of
             fit results. See the example section below.
+        n_jobs (int or None): number of worker processes used to tidy
+            the items of a list/dict input. Use -1 for one process per CPU.
+            If None or 1 (default), items are tidied serially.
+        executor (concurrent.futures.Executor or None): executor used
+            to tidy the items of a list/dict input (e.g. a
+            `ThreadPoolExecutor`). If passed, `n_jobs` is ignored.
+        cache (ResultCache or None): if not None, a :class:`ResultCache`
+            used to reuse DataFrames of fit results tidied in previous
+            calls. Used only when the input is a list/dict.
+        precision (numpy float dtype or None): if not None (e.g.
+            `'float32'`), build a compact DataFrame where all the float
+            columns have this dtype and all the "key" columns (including
+            list indexes) are `pandas.Categorical`. If None (default),
+            float columns are float64.
+        x_eval (array, dict or None): if not None, evaluate the best-fit
+            model (and its components) on this grid instead of the fitted
+            data points, for example to plot smooth curves or a decimated
+            version of large datasets. For models with more than one
+            independent variable, pass a dict of arrays (one for each
+            variable). The returned DataFrame has the columns `x` (or
+            the independent variables names), `best_fit` and one column
+            for each component of composite models. See
+            :func:`augment_on_grid` for details and for the batched
+            evaluation of many fit results. `n_jobs`, `executor`,
+            `cache` and `max_memory` are ignored in this case.
+        max_memory (int, string or None): memory budget for the returned
+            DataFrame, in bytes or as a string such as '2GB'. Used only
+            when the input is a list/dict. If the size estimated by
+            :func:`estimate_memory` is larger, instead of a DataFrame
+            return a generator of DataFrame chunks (as :func:`iter_augment`)
+            or, when `spill_path` is not None, write the rows to a file.
+        spill_path (string or None): path of the file written when the
+            output is larger than `max_memory` (see :func:`write`). In
+            this case the path is returned.
         **kwargs: additional arguments passed to the underlying specialized
             tidying function.
 
@@ -220,15 +312,2048 @@ def augment(results, var_names='key', **kwargs):
         in the list.
 
     """
-    if isinstance(results, lmfit.model.ModelResult):
-        return _augment_lmfit_modelresult(results)
-    elif isinstance(results, list) or isinstance(results, dict):
-        return _multi_dataframe(augment, results, var_names, **kwargs)
+    if x_eval is not None:
+        return augment_on_grid(results, x_eval, var_names,
+                               precision=precision)
+    handler = _profiled_call('dispatch', _find_handler, 'augment', results)
+    if handler is not None:
+        if precision is not None:
+            kwargs['precision'] = precision
+        return _profiled_call(('extract', 'augment', type(results).__name__),
+                              handler, results, **kwargs)
+    elif _is_collection(results):
+        if max_memory is not None:
+            out = _budgeted_output('augment', results, var_names,
+                                   max_memory, spill_path,
+                                   dict(kwargs, precision=precision))
+            if out is not None:
+                return out
+        categorical_keys = 'dict' if precision is None else 'all'
+        return _multi_dataframe(augment, results, var_names, n_jobs=n_jobs,
+                                executor=executor, cache=cache,
+                                categorical_keys=categorical_keys,
+                                precision=precision, **kwargs)
     else:
         msg = 'Sorry, `augment` does not support this object type (%s)'
         raise NotImplementedError(msg % type(results))
 
 
+def augment_on_grid(results, x_eval, var_names='key', precision=None,
+                    batch=False):
+    """Evaluate best-fit models of `lmfit.ModelResult` on a common grid.
+
+    Usually this function is called through :func:`augment` with the
+    argument `x_eval`. For each fit result, the best-fit model and its
+    components (for composite models) are evaluated on the grid `x_eval`.
+
+    When `batch` is True, fit results sharing the same model object are
+    evaluated together: the best-fit parameters are stacked in 2-D
+    arrays (one row per fit result) and the model function is called
+    once for all the fit results. This is correct only for model
+    functions operating element-wise with numpy broadcasting: a model
+    function reducing over its parameters (e.g. normalizing by
+    `np.max(a)`) would mix the parameters of different fit results.
+    The first and last rows of the batched evaluation are checked
+    against the evaluation of single fit results and, if they differ
+    or the model function does not support broadcasting, models are
+    evaluated for each fit result.
+
+    Arguments:
+        results (ModelResult, list or dict): the fit result(s), see
+            :func:`augment`.
+        x_eval (array or dict): grid of the independent variable, or
+            dict of grids for each independent variable.
+        var_names (string or list): name(s) of the "key" column(s), see
+            :func:`augment`.
+        precision (numpy float dtype or None): see :func:`augment`.
+        batch (bool): if True, try the batched evaluation for fit results
+            sharing the same model. Use it only with model functions
+            operating element-wise (see above).
+
+    Returns:
+        A DataFrame with one row for each point in the grid and each fit
+        result, with columns for the grid, `best_fit` and the components.
+    """
+    if _is_collection(results):
+        var_names = _as_list_of_strings_copy(var_names)
+        leaves = list(_iter_leaves(results, len(var_names)))
+    else:
+        leaves = [((), (), results)]
+    leaf_results = [res for _, _, res in leaves]
+    for res in leaf_results:
+        if not isinstance(res, lmfit.model.ModelResult):
+            msg = 'Sorry, `x_eval` is not supported for this object type (%s)'
+            raise NotImplementedError(msg % type(res))
+
+    frames = [None] * len(leaf_results)
+    groups = OrderedDict()
+    for i, res in enumerate(leaf_results):
+        groups.setdefault(id(res.model), []).append(i)
+    for indexes in groups.values():
+        group = [leaf_results[i] for i in indexes]
+        grid = _grid_columns(group[0].model, x_eval)
+        values = None
+        if batch and len(group) > 1:
+            values = _profiled_call('evaluate', _eval_on_grid_batched,
+                                    group, grid)
+        if values is None:
+            values = [_profiled_call('evaluate', _eval_on_grid, res, grid)
+                      for res in group]
+        for i, columns in zip(indexes, values):
+            columns = OrderedDict(list(grid.items()) + list(columns.items()))
+            frames[i] = pd.DataFrame(_cast_floats(columns, precision))
+    if not _is_collection(results):
+        return frames[0]
+    return _concat_frames(frames, var_names,
+                          [key_path for key_path, _, _ in leaves],
+                          [is_dict_path for _, is_dict_path, _ in leaves],
+                          categorical='dict' if precision is None else 'all')
+
+
+def _grid_columns(model, x_eval):
+    """Return an OrderedDict of grid arrays, one for each independent var.
+
+    The column is called `x` when `x_eval` is an array (i.e. the model has
+    one independent variable).
+    """
+    if isinstance(x_eval, dict):
+        return OrderedDict((name, np.ravel(x_eval[name]))
+                           for name in model.independent_vars
+                           if name in x_eval)
+    return OrderedDict(x=np.ravel(x_eval))
+
+
+def _grid_kwargs(model, grid):
+    """Return the keyword arguments to evaluate `model` on `grid`.
+    """
+    if list(grid) == ['x']:
+        return {model.independent_vars[0]: grid['x']}
+    return dict(grid)
+
+
+def _grid_targets(model):
+    """Return a list of (column name, model) to evaluate on a grid.
+    """
+    targets = [('best_fit', model)]
+    if len(model.components) > 1:
+        targets.extend((comp.name, comp) for comp in model.components)
+    return targets
+
+
+def _eval_on_grid(result, grid):
+    """Evaluate best-fit model and components of `result` on `grid`.
+    """
+    kwargs = _grid_kwargs(result.model, grid)
+    shape = np.shape(next(iter(grid.values())))
+    return OrderedDict(
+        (name, np.ravel(np.broadcast_to(model.eval(result.params, **kwargs),
+                                        shape)))
+        for name, model in _grid_targets(result.model))
+
+
+def _eval_on_grid_batched(results, grid):
+    """Evaluate `results` sharing the same model in one call on `grid`.
+
+    Returns a list of OrderedDict (one for each result) or None if the model
+    function does not support evaluation with stacked parameters.
+    """
+    model = results[0].model
+    param_names = tuple(results[0].params)
+    if any(tuple(res.params) != param_names for res in results):
+        return None
+    kwargs = {name: values[:, np.newaxis] for name, values in zip(
+        param_names,
+        np.array([[res.params[name].value for name in param_names]
+                  for res in results]).T)}
+    kwargs.update((name, values[np.newaxis, :]) for name, values in
+                  _grid_kwargs(model, grid).items())
+    shape = (len(results), len(next(iter(grid.values()))))
+    references = {0: _eval_on_grid(results[0], grid),
+                  -1: _eval_on_grid(results[-1], grid)}
+    stacked = OrderedDict()
+    for name, target in _grid_targets(model):
+        try:
+            values = np.broadcast_to(target.eval(params=None, **kwargs),
+                                     shape)
+        except Exception:
+            # Any error in the model function: it does not broadcast
+            return None
+        if not all(np.allclose(values[row], reference[name], equal_nan=True)
+                   for row, reference in references.items()):
+            return None
+        stacked[name] = values
+    return [OrderedDict((name, values[i]) for name, values in stacked.items())
+            for i in range(len(results))]
+
+
+def conf_interval(results, var_names='key', sigmas=(1, 2, 3), timeout=None,
+                  join=True, n_jobs=None, executor=None, **ci_kws):
+    """Tidy DataFrame of confidence intervals of `lmfit.ModelResult`.
+
+    Confidence intervals are computed with `lmfit.conf_interval`, which
+    refits the model many times for each parameter. For a list/dict of
+    fit results, the computation can be distributed on a process pool
+    (see `n_jobs` and `executor` in :func:`tidy`).
+    For each sigma-level in `sigmas`, the returned DataFrame contains the
+    columns "lower_<sigma>sigma" and "upper_<sigma>sigma" with the bounds
+    of the confidence interval (sigmas less than 1 are probabilities and
+    the columns are named "lower_p<sigma>" and "upper_p<sigma>").
+
+    When the computation for a fit result fails (e.g. because `stderr`
+    is not available) or takes more than `timeout` seconds, the bounds
+    for that fit result are NaN and a warning is issued. The timeout is
+    checked after each refit, so that a pathological fit does not stall
+    the whole batch.
+
+    Example::
+
+        >>> dg = br.conf_interval(results, var_names='dataset', sigmas=(1,),
+        ...                       timeout=10, n_jobs=-1)
+        >>> dg[['name', 'value', 'lower_1sigma', 'upper_1sigma']]
+
+    Arguments:
+        results (ModelResult, list or dict): the fit result(s), see
+            :func:`tidy`.
+        var_names (string or list): name(s) of the "key" column(s), see
+            :func:`tidy`.
+        sigmas (sequence of floats): sigma-levels of the confidence
+            intervals.
+        timeout (float or None): maximum time in seconds spent computing
+            the confidence intervals of each fit result. If None, there is
+            no time limit.
+        join (bool): if True, the confidence interval columns are joined
+            to the output of :func:`tidy` on `name` and the "key" columns.
+            Otherwise, the returned DataFrame contains only these columns
+            and the bounds.
+        n_jobs (int or None): number of worker processes, see :func:`tidy`.
+        executor (concurrent.futures.Executor or None): executor used to
+            compute the confidence intervals, see :func:`tidy`.
+        **ci_kws: additional arguments passed to `lmfit.conf_interval`
+            (e.g. `maxiter` or `p_names`).
+
+    Returns:
+        A DataFrame with one row for each parameter (each varied parameter
+        when `join` is False) and each fit result.
+    """
+    func = functools.partial(_conf_interval_frame, sigmas=tuple(sigmas),
+                             timeout=timeout, ci_kws=ci_kws)
+    if _is_collection(results):
+        var_names = _as_list_of_strings_copy(var_names)
+        leaves = list(_iter_leaves(results, len(var_names)))
+        key_paths = [key_path for key_path, _, _ in leaves]
+        outputs = _map_leaves(func, [res for _, _, res in leaves],
+                              [var_names[len(key_path):]
+                               for key_path in key_paths],
+                              n_jobs=n_jobs, executor=executor)
+        df = _concat_frames([frame for frame, _ in outputs], var_names,
+                            key_paths,
+                            [is_dict_path for _, is_dict_path, _ in leaves])
+        on = ['name'] + var_names
+    else:
+        key_paths, outputs = [()], [func(results, None)]
+        df, on = outputs[0][0], ['name']
+    for key_path, (_, message) in zip(key_paths, outputs):
+        if message is not None:
+            warnings.warn('Confidence intervals not computed for the fit '
+                          'result %r: %s' % (key_path, message))
+    if not join:
+        return df
+    return tidy(results, var_names, n_jobs=n_jobs,
+                executor=executor).merge(df, on=on, how='left')
+
+
+class _ConfIntervalTimeout(Exception):
+    """Raised when the time to compute confidence intervals is over.
+    """
+
+
+def _conf_interval_columns(sigmas):
+    """Return the names of the (lower, upper) columns for each sigma.
+    """
+    suffixes = ['%gsigma' % s if s >= 1 else 'p%g' % s for s in sigmas]
+    return [('lower_' + suffix, 'upper_' + suffix) for suffix in suffixes]
+
+
+def _conf_interval_frame(result, var_names, sigmas, timeout, ci_kws):
+    """Compute the confidence intervals of `result` as a DataFrame.
+
+    Returns a tuple (DataFrame, message), where message is None or a string
+    describing the error or timeout. Errors are not raised, so that they
+    do not interrupt the computation for the other fit results.
+    """
+    if not isinstance(result, lmfit.model.ModelResult):
+        msg = ('Sorry, `conf_interval` does not support this object '
+               'type (%s)')
+        raise NotImplementedError(msg % type(result))
+    ci_kws = dict(ci_kws)
+    names = ci_kws.get('p_names')
+    if names is None:
+        names = [name for name, par in result.params.items() if par.vary]
+    names = sorted(names)
+    prob_func = ci_kws.pop('prob_func', None) or lmfit.confidence.f_compare
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        user_prob_func = prob_func
+
+        def prob_func(best_fit, new_fit):
+            if time.monotonic() > deadline:
+                raise _ConfIntervalTimeout()
+            return user_prob_func(best_fit, new_fit)
+
+    bounds = np.full((len(names), len(sigmas), 2), np.nan)
+    message = None
+    # `ModelResult` is also the minimizer used for the refits, which
+    # replace some of its attributes (e.g. `params`): restore them, also
+    # when the computation is interrupted
+    saved_attrs = dict(vars(result))
+    try:
+        ci = lmfit.conf_interval(result, result, sigmas=sigmas,
+                                 prob_func=prob_func, **ci_kws)
+    except _ConfIntervalTimeout:
+        message = 'timeout after %g s' % timeout
+    except (lmfit.minimizer.MinimizerException, ValueError) as exc:
+        message = str(exc)
+    else:
+        # lmfit returns a list of (probability, value) for each parameter:
+        # the lower bounds (decreasing sigma), the best fit value and the
+        # upper bounds (increasing sigma). Bounds of the largest sigmas
+        # are missing when the root finding does not converge.
+        order = np.argsort(sigmas)
+        for i, name in enumerate(names):
+            values = [value for _, value in ci[name]]
+            best = [prob for prob, _ in ci[name]].index(0)
+            lower, upper = values[:best][::-1], values[best + 1:]
+            bounds[i, order[:len(lower)], 0] = lower
+            bounds[i, order[:len(upper)], 1] = upper
+    finally:
+        vars(result).clear()
+        vars(result).update(saved_attrs)
+    columns = OrderedDict([('name', np.array(names, dtype=object))])
+    for j, (lower, upper) in enumerate(_conf_interval_columns(sigmas)):
+        columns[lower] = bounds[:, j, 0]
+        columns[upper] = bounds[:, j, 1]
+    return pd.DataFrame(columns), message
+
+
+NormalizedTidy = namedtuple('NormalizedTidy',
+                            ['specs', 'values', 'keys', 'columns'])
+NormalizedTidy.__doc__ = """Normalized output of :func:`tidy_normalized`.
+
+Fields:
+    specs (DataFrame): one row for each distinct parameter specification
+        (name, bounds, constraint, initial value, etc.), indexed by
+        spec id.
+    values (DataFrame): one row for each parameter of each fit result,
+        with integer `result_id` and `spec_id` columns and the fitted
+        values (e.g. `value` and `stderr`).
+    keys (DataFrame): one row for each fit result, indexed by result id,
+        with the "key" columns.
+    columns (list): columns of the equivalent :func:`tidy` DataFrame.
+"""
+
+_spec_columns = ('name', 'min', 'max', 'vary', 'expr', 'init_value')
+
+
+def tidy_normalized(results, var_names='key', spec_columns=_spec_columns,
+                    **kwargs):
+    """Tidy fit results in normalized tables of specs and fitted values.
+
+    In the output of :func:`tidy` for a collection of fit results, the
+    parameter specifications (e.g. bounds, `vary`, `expr`) are repeated
+    for each fit result, although they are usually the same for fit
+    results of the same model. This function returns instead a table of
+    distinct specifications, a compact table of fitted values referencing
+    the specifications and the fit results with integer ids, and a table
+    of "key" columns for the fit results. Fit results are tidied one at a
+    time, so that the full :func:`tidy` DataFrame is never built.
+    The :func:`tidy` DataFrame can be obtained with
+    :func:`join_normalized`.
+
+    Example::
+
+        >>> norm = br.tidy_normalized(results, var_names='dataset')
+        >>> norm.values.groupby('spec_id').value.mean()
+        >>> df = br.join_normalized(norm)  # same as br.tidy(results, ...)
+
+    Arguments:
+        results (fit result, list or dict): the fit result(s), see
+            :func:`tidy`.
+        var_names (string or list): name(s) of the "key" column(s), see
+            :func:`tidy`.
+        spec_columns (sequence of strings): columns of the :func:`tidy`
+            output stored in the `specs` table (when present).
+        **kwargs: additional arguments passed to :func:`tidy`.
+
+    Returns:
+        A :class:`NormalizedTidy` namedtuple of DataFrames
+        `(specs, values, keys, columns)`.
+    """
+    if _is_collection(results):
+        var_names = _as_list_of_strings_copy(var_names)
+        leaves = list(_iter_leaves(results, len(var_names)))
+    else:
+        var_names, leaves = [], [((), (), results)]
+    spec_ids = {}       # spec row -> spec id
+    block_ids = {}      # specs of all the parameters of a result -> spec ids
+    spec_rows, id_blocks, value_blocks, lengths = [], [], [], []
+    columns = []
+    for key_path, _, res in leaves:
+        frame = _tidy_columns(res, var_names[len(key_path):], kwargs)
+        # Columns missing in previous fit results are added as in `tidy`
+        columns += [c for c in frame if c not in columns]
+        spec_names = [c for c in columns if c in spec_columns]
+        specs = [frame.get(c) for c in spec_names]
+        length = len(next(iter(frame.values())))
+        block = tuple(None if col is None else
+                      (c, col.tobytes()) if col.dtype.kind in 'biuf' else
+                      (c, tuple(col)) for c, col in zip(spec_names, specs))
+        ids = block_ids.get(block)
+        if ids is None:
+            specs = [[None] * length if col is None else col
+                     for col in specs]
+            ids = np.empty(length, dtype=np.int32)
+            rows = zip(*specs) if specs else [()] * length
+            for i, row in enumerate(rows):
+                # NaN != NaN, use None in the hashed row. Trailing None
+                # are stripped to match rows tidied before adding columns.
+                row_key = [None if v != v else v for v in row]
+                while row_key and row_key[-1] is None:
+                    row_key.pop()
+                row_key = tuple(row_key)
+                if row_key not in spec_ids:
+                    spec_ids[row_key] = len(spec_rows)
+                    spec_rows.append(row)
+                ids[i] = spec_ids[row_key]
+            block_ids[block] = ids
+        id_blocks.append(ids)
+        value_blocks.append(frame)
+        lengths.append(length)
+    if not columns:
+        raise ValueError('`results` does not contain any fit result.')
+
+    spec_names = [c for c in columns if c in spec_columns]
+    value_names = [c for c in columns if c not in spec_columns]
+    specs = OrderedDict()
+    for j, c in enumerate(spec_names):
+        column = [row[j] if j < len(row) else None for row in spec_rows]
+        missing = any(v is None for v in column)
+        dtype = _missing_dtype([frame[c].dtype for frame in value_blocks
+                                if c in frame], missing)
+        specs[c] = np.array([_missing_value(dtype) if v is None else v
+                             for v in column], dtype=dtype)
+    specs = pd.DataFrame(specs)
+    specs.index.name = 'spec_id'
+    values = OrderedDict([
+        ('result_id', np.repeat(np.arange(len(leaves), dtype=np.int32),
+                                lengths)),
+        ('spec_id', np.concatenate(id_blocks)),
+    ])
+    for c in value_names:
+        dtype = _missing_dtype(
+            [frame[c].dtype for frame in value_blocks if c in frame],
+            any(c not in frame for frame in value_blocks))
+        values[c] = np.concatenate([
+            frame[c].astype(dtype, copy=False) if c in frame else
+            np.full(n, _missing_value(dtype), dtype=dtype)
+            for frame, n in zip(value_blocks, lengths)])
+    if var_names:
+        keys = pd.DataFrame(_key_columns(
+            var_names, [key_path for key_path, _, _ in leaves],
+            [is_dict_path for _, is_dict_path, _ in leaves],
+            np.ones(len(leaves), dtype=int)))
+        columns += [c for c in keys.columns if c not in columns]
+    else:
+        keys = pd.DataFrame(index=range(1))
+    keys.index.name = 'result_id'
+    return NormalizedTidy(specs, pd.DataFrame(values), keys, columns)
+
+
+def _missing_dtype(dtypes, missing):
+    """Return the dtype of a column of `dtypes` arrays.
+
+    If `missing` is True (some fit results lack the column), the dtype is
+    promoted to support missing values.
+    """
+    dtype = np.result_type(*dtypes)
+    if dtype.kind in 'US':
+        dtype = np.dtype(object)
+    if missing:
+        dtype = _ColumnBuffers._with_missing(np.empty(0, dtype)).dtype
+    return dtype
+
+
+def _tidy_columns(result, var_names, kwargs):
+    """Return the columns of `tidy(result)` as an OrderedDict of arrays.
+    """
+    if _find_handler('tidy', result) is _tidy_lmfit:
+        columns = _tidy_lmfit_columns(result)
+        for c in ('name', 'expr'):
+            columns[c] = np.array(columns[c], dtype=object)
+        return columns
+    frame = tidy(result, var_names, **kwargs)
+    return OrderedDict((c, frame[c].values) for c in frame.columns)
+
+
+def join_normalized(normalized):
+    """Join the tables of :func:`tidy_normalized` in a :func:`tidy` DataFrame.
+
+    Arguments:
+        normalized (NormalizedTidy): output of :func:`tidy_normalized`.
+
+    Returns:
+        The DataFrame returned by :func:`tidy` for the same fit results.
+    """
+    specs, values, keys, columns = normalized
+    spec_id = values['spec_id'].values
+    result_id = values['result_id'].values
+    df = OrderedDict()
+    for c in columns:
+        if c in specs.columns:
+            df[c] = specs[c].values.take(spec_id)
+        elif c in keys.columns:
+            df[c] = keys[c].values.take(result_id)
+        else:
+            df[c] = values[c].values
+    return pd.DataFrame(df)
+
+
+TidyMatrix = namedtuple('TidyMatrix', ['values', 'stderr', 'keys', 'names'])
+TidyMatrix.__doc__ = """Output of :func:`tidy_matrix`.
+
+Fields:
+    values (2-D array): fitted values, one row for each fit result and
+        one column for each parameter.
+    stderr (2-D array or None): standard errors, same shape as `values`.
+    keys (1-D object array): key of each fit result (row). For nested
+        `results`, keys are tuples (e.g. `('A', 0)`).
+    names (1-D object array): parameter name of each column.
+"""
+
+
+def tidy_matrix(results, names=None, stderr=False, param_names=None):
+    """Fitted values of a collection of fit results as a 2-D array.
+
+    The array has one row for each fit result and one column for each
+    parameter, i.e. the pivot of the :func:`tidy` DataFrame on the
+    parameter names. The array is filled directly from the fit results,
+    without building the long-form DataFrame. Parameters missing in a
+    fit result are NaN.
+
+    Example::
+
+        >>> m = br.tidy_matrix(results, stderr=True)
+        >>> df = pd.DataFrame(m.values, index=m.keys, columns=m.names)
+
+    Arguments:
+        results (fit result, list or dict): the fit result(s), see
+            :func:`tidy`.
+        names (list of strings or None): names of the parameters (columns)
+            in the returned array. If None, all the parameters in
+            `results` in sorted order.
+        stderr (bool): if True, return also the array of standard errors
+            (NaN when not available, e.g. for scipy fit results).
+        param_names (string or list of string): names of the fitted
+            parameters for scipy's `OptimizeResult`, see :func:`tidy`.
+
+    Returns:
+        A :class:`TidyMatrix` namedtuple `(values, stderr, keys, names)`.
+    """
+    if _is_collection(results):
+        leaves = list(_iter_leaves(results, float('inf')))
+    else:
+        leaves = [((), (), results)]
+    kwargs = {} if param_names is None else dict(param_names=param_names)
+    rows = [_matrix_row(res, kwargs) for _, _, res in leaves]
+    if names is None:
+        all_names = set()
+        for row_names in set(row_names for row_names, _, _ in rows):
+            all_names.update(row_names)
+        names = sorted(all_names)
+    names = list(names)
+    position = {name: j for j, name in enumerate(names)}
+    values = np.full((len(rows), len(names)), np.nan)
+    errors = np.full((len(rows), len(names)), np.nan) if stderr else None
+    columns = {}  # parameter names of a fit result -> (rows, columns)
+    for i, (row_names, row_values, row_errors) in enumerate(rows):
+        index = columns.get(row_names)
+        if index is None:
+            index = [(k, position[name]) for k, name in enumerate(row_names)
+                     if name in position]
+            index = columns[row_names] = tuple(
+                np.array(idx, dtype=int) for idx in zip(*index)) or None
+        if index is None:
+            continue
+        values[i, index[1]] = np.asarray(row_values)[index[0]]
+        if stderr:
+            errors[i, index[1]] = _float_array(row_errors)[index[0]]
+    key_paths = [key_path for key_path, _, _ in leaves]
+    if all(len(key_path) == 1 for key_path in key_paths):
+        key_paths = [key_path[0] for key_path in key_paths]
+    keys = np.empty(len(leaves), dtype=object)
+    keys[:] = key_paths
+    return TidyMatrix(values, errors, keys, np.array(names, dtype=object))
+
+
+def _matrix_row(result, kwargs):
+    """Return the tuple (names, values, stderrs) of parameters of `result`.
+    """
+    handler = _find_handler('tidy', result)
+    if handler is _tidy_lmfit:
+        params = result.params
+        names = tuple(params)
+        return (names, [params[name].value for name in names],
+                [params[name].stderr for name in names])
+    if handler is _tidy_scipy and 'param_names' in kwargs:
+        names = _scipy_plan(kwargs['param_names']).fields
+        return names, result.x, [None] * len(names)
+    columns = _tidy_columns(result, [], kwargs)
+    stderrs = columns.get('stderr', [None] * len(columns['name']))
+    return tuple(columns['name']), columns['value'], stderrs
+
+
+async def tidy_async(results, var_names='key', **kwargs):
+    """Async version of :func:`tidy` accepting awaitable fit results.
+
+    See :func:`augment_async` for details.
+    """
+    return await _dispatch_async(tidy, results, var_names, **kwargs)
+
+
+async def glance_async(results, var_names='key', **kwargs):
+    """Async version of :func:`glance` accepting awaitable fit results.
+
+    See :func:`augment_async` for details.
+    """
+    return await _dispatch_async(glance, results, var_names, **kwargs)
+
+
+async def augment_async(results, var_names='key', precision=None,
+                        **kwargs):
+    """Async version of :func:`augment` accepting awaitable fit results.
+
+    `results` can be an awaitable (e.g. a coroutine or an
+    `asyncio.Future`) resolving to a fit result, or a list/dict (also
+    nested) whose items are fit results or awaitables. Awaitables are
+    awaited concurrently and each fit result is tidied as soon as it
+    is available, while the other fits are still running.
+    The returned DataFrame is the same returned by :func:`augment` on the
+    collection of the resolved fit results.
+
+    Note that :func:`glance`, :func:`tidy` and :func:`augment` accept
+    `concurrent.futures.Future` items in `results`, tidying the fit
+    results in completion order.
+
+    Example::
+
+        >>> async def fit(y):
+        ...     loop = asyncio.get_running_loop()
+        ...     return await loop.run_in_executor(pool, model.fit, y, params)
+        >>> df = await br.augment_async({k: fit(y) for k, y in data.items()})
+
+    Arguments:
+        results (awaitable, fit result object, list or dict): fit results.
+        var_names (string or list): name(s) of the column(s) containing
+            an "index" that is different for each element in the set of
+            fit results.
+        precision (numpy float dtype or None): see :func:`augment`.
+        **kwargs: additional arguments passed to the underlying specialized
+            tidying function.
+
+    Returns:
+        A DataFrame as returned by :func:`augment`.
+    """
+    if precision is not None:
+        kwargs.update(precision=precision, categorical_keys='all')
+    return await _dispatch_async(augment, results, var_names, **kwargs)
+
+
+async def _dispatch_async(func, results, var_names, categorical_keys='dict',
+                          **kwargs):
+    """Await `results` if needed and tidy them with `func`.
+    """
+    if inspect.isawaitable(results):
+        results = await results
+    if _is_collection(results):
+        return await _multi_dataframe_async(
+            func, results, var_names, categorical_keys=categorical_keys,
+            **kwargs)
+    return func(results, var_names, **kwargs)
+
+
+def register(kind, result_type, func=None):
+    """Register a function to tidy fit results of type `result_type`.
+
+    After registration, :func:`tidy`, :func:`glance` or :func:`augment`
+    (depending on `kind`) call `func(result, **kwargs)` for each
+    fit result which is an instance of `result_type` (or of a subclass),
+    where `kwargs` are the additional arguments of the pybroom call.
+    `func` needs to return a DataFrame. Registering a type already
+    registered replaces the previous function.
+    This function can also be used as a decorator::
+
+        @pybroom.register('glance', MyFitResult)
+        def glance_my_fit_result(result, **kwargs):
+            return pd.DataFrame({'cost': [result.cost]})
+
+    Arguments:
+        kind (string): one of 'tidy', 'glance' or 'augment'.
+        result_type (type or tuple of types): type(s) of the fit results
+            handled by `func`.
+        func (callable or None): the tidying function. If None, return
+            a decorator registering the decorated function.
+
+    Returns:
+        `func` or, when `func` is None, a decorator.
+    """
+    if kind not in _handlers:
+        msg = '`kind` should be one of %s. Got %r.'
+        raise ValueError(msg % (sorted(_handlers), kind))
+    if func is None:
+        return functools.partial(register, kind, result_type)
+    if not isinstance(result_type, tuple):
+        result_type = (result_type,)
+    for rtype in result_type:
+        _handlers[kind][rtype] = func
+    _handlers_cache.clear()
+    return func
+
+
+# Tidying function for each kind and type of fit result (see `register`)
+_handlers = {'tidy': {}, 'glance': {}, 'augment': {}}
+# Resolved `_handlers` lookups: (kind, type) -> function or None
+_handlers_cache = {}
+
+
+def _find_handler(kind, result):
+    """Return the function registered to tidy `result` or None.
+
+    The function registered for the closest type in the MRO of `result`
+    is returned. Lookups are cached by type.
+    """
+    key = (kind, type(result))
+    try:
+        return _handlers_cache[key]
+    except KeyError:
+        pass
+    handlers = _handlers[kind]
+    handler = next((handlers[rtype] for rtype in type(result).__mro__
+                    if rtype in handlers), None)
+    _handlers_cache[key] = handler
+    return handler
+
+
+def iter_tidy(results, var_names='key', chunksize=100000, **kwargs):
+    """Iterate over tidy DataFrame chunks of fitted parameter data.
+
+    Streaming version of :func:`tidy`. See :func:`iter_augment` for details
+    on the input types and on the returned chunks.
+    """
+    return _iter_dataframes(tidy, results, var_names, chunksize, **kwargs)
+
+
+def iter_glance(results, var_names='key', chunksize=100000, **kwargs):
+    """Iterate over tidy DataFrame chunks of fit summaries.
+
+    Streaming version of :func:`glance`. See :func:`iter_augment` for details
+    on the input types and on the returned chunks.
+    """
+    return _iter_dataframes(glance, results, var_names, chunksize, **kwargs)
+
+
+def iter_augment(results, var_names='key', chunksize=100000, **kwargs):
+    """Iterate over tidy DataFrame chunks of fit data.
+
+    Streaming version of :func:`augment`. Fit results are consumed one at
+    a time, and the rows are returned in chunks of `chunksize` rows as soon
+    as they are available. Therefore the input can be a lazy iterable
+    (e.g. a generator of fit results) and neither the full collection of
+    fit results nor the full DataFrame need to be in memory at once.
+    Concatenating all the chunks gives the same rows returned by
+    :func:`augment`, except that "key" columns are never categorical
+    (since the set of keys is not known in advance).
+
+    Arguments:
+        results (iterable): a list/dict (also nested) of fit results, as
+            in :func:`augment`, or any iterable of fit results or of
+            `(key, result)` pairs. In the latter case `result` can also be
+            a list/dict of fit results. Items of iterables which are not
+            pairs are identified by their position (as in a list).
+        var_names (string or list): name(s) of the column(s) containing
+            an "index" that is different for each element in the set of
+            fit results.
+        chunksize (int): number of rows in each returned DataFrame.
+            Only the last DataFrame can have fewer rows.
+        **kwargs: additional arguments passed to the underlying specialized
+            tidying function.
+
+    Returns:
+        A generator of DataFrames. The index of the DataFrames is the row
+        number in the (virtual) concatenation of all the chunks.
+    """
+    return _iter_dataframes(augment, results, var_names, chunksize, **kwargs)
+
+
+def augment_stats(results, var_names='key', by=None, x='x',
+                  columns=('best_fit', 'residual'),
+                  quantiles=(0.05, 0.5, 0.95)):
+    """Statistics of the :func:`augment` columns across fit results.
+
+    For each value of the independent variable `x`, computes the mean,
+    standard deviation and quantiles of `columns` (e.g. `best_fit`)
+    across all the fit results, or across the fit results in each group
+    defined by the "key" columns `by`. Fit results are consumed one at a
+    time updating running statistics, so that memory usage is
+    proportional to the number of data points and not to the
+    number of fit results (the :func:`augment` DataFrame is never built).
+    Mean and standard deviation are exact, while quantiles are estimated
+    with the P-square algorithm (exact up to 50 fit results per group).
+    All the fit results in a group need to have the same `x`.
+
+    Example::
+
+        >>> results = {'A': [fit_a1, fit_a2, ...], 'B': [fit_b1, ...]}
+        >>> br.augment_stats(results, var_names=['sample', 'replicate'],
+        ...                  by='sample')
+
+    Arguments:
+        results (iterable): fit results, any input supported by
+            :func:`iter_augment` (e.g. a list, a dict or a generator).
+        var_names (string or list): name(s) of the "key" column(s), see
+            :func:`augment`.
+        by (string, list or None): name(s) of the "key" column(s)
+            (in `var_names`) defining the groups. If None, statistics are
+            computed across all the fit results.
+        x (string or list): name(s) of the independent variable column(s)
+            in the :func:`augment` DataFrame.
+        columns (sequence of strings): :func:`augment` columns for which
+            the statistics are computed.
+        quantiles (sequence of floats): quantiles to estimate, between
+            0 and 1.
+
+    Returns:
+        A DataFrame with one row for each `x` value (and each group). Columns
+        are the `by` key columns, the `x` column(s), `count` (number of
+        fit results) and for each column in `columns` (e.g. `best_fit`):
+        `best_fit_mean`, `best_fit_std` and one column for each quantile
+        (e.g. `best_fit_q0.05`).
+    """
+    var_names = _as_list_of_strings_copy(var_names)
+    by = [] if by is None else _as_list_of_strings_copy(by)
+    for name in by:
+        if name not in var_names:
+            msg = '`by` items should be in `var_names` %s. Got %r.'
+            raise ValueError(msg % (var_names, name))
+    levels = [var_names.index(name) for name in by]
+    x = _as_list_of_strings_copy(x)
+    columns = list(columns)
+    groups = OrderedDict()  # group key -> (is_dict_path, x arrays, stats)
+    for key_path, is_dict_path, res in _iter_lazy_leaves(results,
+                                                         len(var_names)):
+        data = _augment_columns(res, var_names[len(key_path):])
+        group_key = tuple(key_path[level] for level in levels)
+        if group_key not in groups:
+            x_arrays = [np.asarray(data[name]) for name in x]
+            stats = _RunningStats(len(columns), len(x_arrays[0]), quantiles)
+            groups[group_key] = (
+                tuple(is_dict_path[level] for level in levels), x_arrays,
+                stats)
+        _, x_arrays, stats = groups[group_key]
+        if any(not np.array_equal(data[name], values)
+               for name, values in zip(x, x_arrays)):
+            msg = ('All the fit results in a group should have the same `x`.'
+                   ' Different `x` for the fit result %r.')
+            raise ValueError(msg % (key_path,))
+        stats.update(np.vstack([data[name] for name in columns]))
+
+    frames = []
+    for _, x_arrays, stats in groups.values():
+        out = OrderedDict(zip(x, x_arrays))
+        out['count'] = np.full(len(x_arrays[0]), stats.count)
+        mean, std, quantile_values = stats.result()
+        for i, name in enumerate(columns):
+            out[name + '_mean'] = mean[i]
+            out[name + '_std'] = std[i]
+            for q, values in zip(quantiles, quantile_values):
+                out['%s_q%g' % (name, q)] = values[i]
+        frames.append(pd.DataFrame(out))
+    if not frames:
+        raise ValueError('`results` does not contain any fit result.')
+    if not by:
+        return frames[0]
+    return _concat_frames(frames, by, list(groups),
+                          [is_dict_path for is_dict_path, _, _
+                           in groups.values()])
+
+
+def _augment_columns(result, var_names):
+    """Return the columns of `augment(result)` as an OrderedDict.
+    """
+    if _find_handler('augment', result) is _augment_lmfit:
+        return _augment_lmfit_columns(result)
+    frame = augment(result, var_names)
+    return OrderedDict((c, frame[c].values) for c in frame.columns)
+
+
+class _RunningStats:
+    """Running mean, standard deviation and quantiles of 2-D arrays.
+
+    Each call to `update` adds one observation for each element of the
+    arrays. The mean and variance are updated with Welford's algorithm.
+    """
+    def __init__(self, num_rows, num_cols, quantiles):
+        self.count = 0
+        self.mean = np.zeros((num_rows, num_cols))
+        self.m2 = np.zeros((num_rows, num_cols))
+        self.quantiles = _P2Quantiles(quantiles, (num_rows, num_cols))
+
+    def update(self, values):
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+        if len(self.quantiles.q) > 0:
+            self.quantiles.update(values)
+
+    def result(self):
+        """Return (mean, std, array of quantiles).
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        if self.count < 2:
+            std = np.full_like(self.mean, np.nan)
+        return self.mean, std, self.quantiles.result()
+
+
+class _P2Quantiles:
+    """Estimate `quantiles` of a stream of arrays with P-square.
+
+    The P-square algorithm (Jain and Chlamtac, 1985) tracks 5 markers
+    for each quantile and each element of the arrays, so memory does not
+    grow with the number of observations. Updates are vectorized over the
+    quantiles and the elements. Since P-square estimates are poor for
+    few observations, the first `exact_size` observations are also
+    stored and, until there are more observations, the returned
+    quantiles are exact.
+    """
+    def __init__(self, quantiles, shape, exact_size=50):
+        q = np.asarray(quantiles, dtype=float)
+        self.q = q
+        self.shape = (len(q),) + tuple(shape)
+        self.exact_size = exact_size
+        self.count = 0
+        self.initial = []  # first `exact_size` observations (at least 5)
+        # Marker heights and positions, markers along the first axis
+        self.heights = self.positions = None
+        expand = (slice(None), slice(None)) + (np.newaxis,) * len(shape)
+        self.desired = np.array([0 * q, 2 * q, 4 * q, 2 + 2 * q,
+                                 4 + 0 * q])[expand]
+        self.increments = np.array([0 * q, q / 2, q, (1 + q) / 2,
+                                    1 + 0 * q])[expand]
+
+    def update(self, values):
+        self.count += 1
+        if self.count <= max(self.exact_size, 5):
+            self.initial.append(np.array(values, dtype=float))
+        else:
+            self.initial = []
+        if self.count < 5:
+            return
+        if self.count == 5:
+            self.heights = np.broadcast_to(
+                np.sort(np.array(self.initial[:5]), axis=0)[:, np.newaxis],
+                (5,) + self.shape).copy()
+            self.positions = np.broadcast_to(
+                np.arange(5.).reshape((5,) + (1,) * len(self.shape)),
+                self.heights.shape).copy()
+            return
+        h, n = self.heights, self.positions
+        np.minimum(h[0], values, out=h[0])
+        np.maximum(h[4], values, out=h[4])
+        cell = np.sum(values >= h[1:4], axis=0)
+        n[1:] += np.arange(1, 5).reshape((4,) + (1,) * len(self.shape)) > cell
+        self.desired = self.desired + self.increments
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            step = (((d >= 1) & (n[i + 1] - n[i] > 1)).astype(float) -
+                    ((d <= -1) & (n[i - 1] - n[i] < -1)))
+            if not step.any():
+                continue
+            parabolic = h[i] + step / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) /
+                (n[i + 1] - n[i]) +
+                (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) /
+                (n[i] - n[i - 1]))
+            h_next = np.where(step > 0, h[i + 1], h[i - 1])
+            n_next = np.where(step > 0, n[i + 1], n[i - 1])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                linear = h[i] + step * (h_next - h[i]) / (n_next - n[i])
+            new = np.where((h[i - 1] < parabolic) & (parabolic < h[i + 1]),
+                           parabolic, linear)
+            h[i] = np.where(step != 0, new, h[i])
+            n[i] += step
+
+    def result(self):
+        """Return an array of estimates, quantiles along the first axis.
+        """
+        if self.count == 0:
+            return np.full(self.shape, np.nan)
+        if self.count <= self.exact_size or self.heights is None:
+            return np.quantile(np.array(self.initial), self.q, axis=0)
+        return self.heights[2].copy()
+
+
+class RaggedFrame:
+    """Columnar, offset-indexed version of the :func:`augment` DataFrame.
+
+    Instances are created by :func:`augment_ragged`. The rows of all the
+    fit results are stored in one flat array for each column, and the rows
+    of the fit result number `i` are `offsets[i]:offsets[i + 1]`.
+    The "key" columns are stored once for each fit result (not for each
+    row). The rows of a single fit result are returned as views of the
+    flat arrays (no copy), and the long-form DataFrame is built only when
+    calling :meth:`to_dataframe`.
+
+    Example::
+
+        >>> rf = br.augment_ragged(results, var_names=['sample', 'rep'])
+        >>> rf['A', 3]['best_fit']       # array view, no copy
+        >>> rf.to_dataframe()             # same as br.augment(...)
+
+    Attributes:
+        columns (OrderedDict): flat 1-D array of each column.
+        offsets (array of int64): start row of each fit result, plus the
+            total number of rows as last element.
+        key_paths (list): key of each fit result (a tuple of keys for
+            each nesting level).
+        var_names (list of strings): names of the "key" columns.
+    """
+    def __init__(self, columns, offsets, key_paths, is_dict_paths,
+                 var_names, categorical_keys='dict'):
+        self.columns = columns
+        self.offsets = offsets
+        self.key_paths = key_paths
+        self.var_names = var_names
+        self._is_dict_paths = is_dict_paths
+        self._categorical_keys = categorical_keys
+        self._positions = None
+
+    def __len__(self):
+        return len(self.key_paths)
+
+    def __repr__(self):
+        return '<RaggedFrame of %d fit results, %d rows, columns %s>' % (
+            len(self), self.offsets[-1], list(self.columns))
+
+    def __getitem__(self, key):
+        """Return the columns of the fit result `key` (see :meth:`loc`).
+        """
+        return self.loc(key)
+
+    @property
+    def lengths(self):
+        """Number of rows of each fit result."""
+        return np.diff(self.offsets)
+
+    @property
+    def keys(self):
+        """DataFrame of "key" columns, with one row for each fit result."""
+        return pd.DataFrame(_key_columns(
+            self.var_names, self.key_paths, self._is_dict_paths,
+            np.ones(len(self), dtype=int), categorical=self._categorical_keys))
+
+    def iloc(self, i):
+        """Return the columns of the fit result number `i` (array views).
+        """
+        start, stop = self.offsets[i], self.offsets[i + 1]
+        return OrderedDict((name, values[start:stop])
+                           for name, values in self.columns.items())
+
+    def loc(self, key):
+        """Return the columns of the fit result `key` (array views).
+
+        `key` is the key of the fit result in `results`, or a tuple of keys
+        (one for each nesting level) for nested `results`.
+        """
+        if self._positions is None:
+            self._positions = {path: i
+                               for i, path in enumerate(self.key_paths)}
+        path = key if isinstance(key, tuple) else (key,)
+        try:
+            return self.iloc(self._positions[path])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def frame(self, key):
+        """Return the DataFrame (without key columns) of the fit result `key`.
+        """
+        return pd.DataFrame(self.loc(key), copy=False)
+
+    def to_dataframe(self):
+        """Return the long-form DataFrame, as returned by :func:`augment`.
+        """
+        df = pd.DataFrame(self.columns, copy=False)
+        return _add_key_columns(df, self.lengths, self.var_names,
+                                self.key_paths, self._is_dict_paths,
+                                categorical=self._categorical_keys)
+
+
+def augment_ragged(results, var_names='key', precision=None):
+    """Tidy fit data of a collection of fit results in a :class:`RaggedFrame`.
+
+    Like :func:`augment`, but instead of a long-form DataFrame return a
+    :class:`RaggedFrame`, which stores the columns in flat arrays indexed
+    by the offset of each fit result, and the "key" columns once for each
+    fit result. This is convenient to access the data of single fit
+    results in large collections (especially when fit results have
+    different number of data points), without scanning or filtering a
+    DataFrame.
+
+    Arguments:
+        results (list or dict): collection of fit results, see
+            :func:`augment`.
+        var_names (string or list): name(s) of the "key" column(s), see
+            :func:`augment`.
+        precision (numpy float dtype or None): see :func:`augment`.
+
+    Returns:
+        A :class:`RaggedFrame`.
+    """
+    if not _is_collection(results):
+        msg = '`results` should be a list or a dict of fit results (got %s).'
+        raise TypeError(msg % type(results))
+    var_names = _as_list_of_strings_copy(var_names)
+    leaves = list(_iter_leaves(results, len(var_names)))
+    blocks = [_cast_floats(_augment_columns(res, var_names[len(key_path):]),
+                           precision)
+              for key_path, _, res in leaves]
+    lengths = [len(next(iter(block.values()))) if block else 0
+               for block in blocks]
+    offsets = np.zeros(len(blocks) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    names = list(OrderedDict.fromkeys(name for block in blocks
+                                      for name in block))
+    columns = OrderedDict()
+    for name in names:
+        dtype = next(block[name].dtype for block in blocks if name in block)
+        if not np.issubdtype(dtype, np.floating):
+            dtype = float
+        # Fit results without this column (e.g. no components) get NaNs
+        columns[name] = np.concatenate([
+            block[name] if name in block else np.full(length, np.nan, dtype)
+            for block, length in zip(blocks, lengths)])
+    return RaggedFrame(columns, offsets,
+                       [key_path for key_path, _, _ in leaves],
+                       [is_dict_path for _, is_dict_path, _ in leaves],
+                       var_names,
+                       categorical_keys='dict' if precision is None else 'all')
+
+
+MemoryEstimate = namedtuple('MemoryEstimate', ['rows', 'nbytes'])
+MemoryEstimate.__doc__ = """Output of :func:`estimate_memory`.
+
+Fields:
+    rows (int): number of rows of the DataFrame.
+    nbytes (int): estimated size in bytes of the DataFrame columns
+        (Python objects referenced by object columns, e.g. strings,
+        are not included).
+"""
+
+
+def estimate_memory(results, kind='augment', var_names='key', **kwargs):
+    """Estimate rows and size of the DataFrame of :func:`augment` & co.
+
+    The estimate is computed from the structure of `results` and from the
+    number of parameters and data points of each fit result, without
+    building any DataFrame (except for fit result types registered with
+    :func:`register`, which are tidied to measure them).
+    Note that building the DataFrame for a list/dict of fit results
+    needs temporarily about twice this memory, since per-result
+    DataFrames are concatenated.
+
+    Arguments:
+        results (fit result, list or dict): fit results, see :func:`augment`.
+        kind (string): 'tidy', 'glance' or 'augment'.
+        var_names (string or list): name(s) of the "key" column(s).
+        **kwargs: additional arguments for the tidying function
+            (e.g. `precision` for 'augment', `param_names` for 'tidy').
+
+    Returns:
+        A :class:`MemoryEstimate` namedtuple `(rows, nbytes)`.
+    """
+    if kind not in _handlers:
+        msg = '`kind` should be in %s. Got %r.'
+        raise ValueError(msg % (sorted(_handlers), kind))
+    if _is_collection(results):
+        var_names = _as_list_of_strings_copy(var_names)
+        leaves = list(_iter_leaves(results, len(var_names)))
+    else:
+        leaves = [((), (), results)]
+    rows = nbytes = 0
+    for key_path, _, res in leaves:
+        leaf_rows, row_bytes = _estimate_leaf(kind, res, kwargs)
+        rows += leaf_rows
+        # Key columns: int64 list indexes or (smaller) categorical codes
+        nbytes += leaf_rows * (row_bytes + 8 * len(key_path))
+    return MemoryEstimate(rows, int(nbytes))
+
+
+def _estimate_leaf(kind, result, kwargs):
+    """Return (number of rows, bytes per row) of `kind` for `result`.
+    """
+    handler = _find_handler(kind, result)
+    if handler is _augment_lmfit:
+        itemsize = np.dtype(kwargs.get('precision') or float).itemsize
+        num_components = len(result.components)
+        num_columns = (len(_independent_var_columns(result)) + 3 +
+                       (num_components if num_components > 1 else 0))
+        return np.size(result.data), num_columns * itemsize
+    if handler is _tidy_lmfit:
+        # 5 float columns, `vary` (bool), `name` and `expr` (objects)
+        return len(result.params), 5 * 8 + 1 + 2 * 8
+    if handler is _tidy_scipy:
+        # `name` (object), `value`, `grad` and `active_mask`
+        return np.size(result.x), 4 * 8
+    if handler in (_glance_lmfit, glance_scipy_result):
+        return 1, 16 * 8
+    if handler is None:
+        msg = 'Sorry, `%s` does not support this object type (%s)'
+        raise NotImplementedError(msg % (kind, type(result)))
+    frame = handler(result, **kwargs)
+    row_bytes = frame.memory_usage(index=False).sum() / max(len(frame), 1)
+    return len(frame), row_bytes
+
+
+def _parse_memory(size):
+    """Return the number of bytes in `size` (int or string like '2GB').
+    """
+    if isinstance(size, str):
+        units = OrderedDict([('KB', 2**10), ('MB', 2**20), ('GB', 2**30),
+                             ('TB', 2**40), ('B', 1)])
+        text = size.strip().upper()
+        for unit, factor in units.items():
+            if text.endswith(unit):
+                return int(float(text[:-len(unit)]) * factor)
+        return int(float(text))
+    return int(size)
+
+
+def _budgeted_output(kind, results, var_names, max_memory, spill_path,
+                     kwargs):
+    """Stream or spill the output of `kind` if larger than `max_memory`.
+
+    Returns None if the estimated output fits in `max_memory`. Otherwise
+    writes the output to `spill_path` (if not None) and returns the path,
+    or returns a generator of DataFrame chunks (see :func:`iter_augment`).
+    Chunks are sized to use at most half of `max_memory`.
+    """
+    max_memory = _parse_memory(max_memory)
+    estimate = estimate_memory(results, kind, var_names, **kwargs)
+    if estimate.nbytes <= max_memory:
+        return None
+    row_bytes = estimate.nbytes / max(estimate.rows, 1)
+    chunksize = max(1, int(max_memory / 2 // row_bytes))
+    if spill_path is not None:
+        write(results, spill_path, kind=kind, var_names=var_names,
+              chunksize=chunksize, **kwargs)
+        return spill_path
+    iter_funcs = {'tidy': iter_tidy, 'glance': iter_glance,
+                  'augment': iter_augment}
+    return iter_funcs[kind](results, var_names, chunksize=chunksize,
+                            **kwargs)
+
+
+def write(results, path, kind='augment', var_names='key', format=None,
+          chunksize=100000, **kwargs):
+    """Write the tidy DataFrame of `results` to a file, streaming the rows.
+
+    Rows are computed by :func:`iter_tidy`, :func:`iter_glance` or
+    :func:`iter_augment` and written to the file one chunk at a time,
+    so that the full DataFrame is never in memory. With the Parquet
+    format each chunk is a row group and the "key" columns (`var_names`)
+    are dictionary-encoded.
+
+    Arguments:
+        results (iterable): fit results. Any input accepted by
+            :func:`iter_augment` is valid.
+        path (string): path of the output file.
+        kind (string): type of data to write. Valid values are
+            'tidy', 'glance' or 'augment'.
+        var_names (string or list): name(s) of the column(s) containing
+            an "index" that is different for each element in the set of
+            fit results.
+        format (string or None): output format, 'parquet' or 'csv'. If
+            None, use 'parquet' when `pyarrow` is installed, otherwise
+            fall back to 'csv' with a warning.
+        chunksize (int): number of rows in each written chunk
+            (i.e. the Parquet row group size).
+        **kwargs: additional arguments passed to the underlying specialized
+            tidying function.
+
+    Returns:
+        The format used to write the file ('parquet' or 'csv').
+    """
+    iter_funcs = {'tidy': iter_tidy, 'glance': iter_glance,
+                  'augment': iter_augment}
+    if kind not in iter_funcs:
+        msg = '`kind` should be one of %s. Got %r.'
+        raise ValueError(msg % (sorted(iter_funcs), kind))
+    if format not in (None, 'parquet', 'csv'):
+        raise ValueError("`format` should be 'parquet' or 'csv'.")
+    if format is None:
+        try:
+            import pyarrow  # noqa
+            format = 'parquet'
+        except ImportError:
+            warnings.warn('pyarrow is not installed, writing CSV instead of '
+                          'Parquet.')
+            format = 'csv'
+    chunks = iter_funcs[kind](results, var_names, chunksize=chunksize,
+                              **kwargs)
+    key_names = _as_list_of_strings_copy(var_names)
+    if format == 'parquet':
+        _write_parquet(chunks, path, key_names)
+    else:
+        _write_csv(chunks, path, key_names)
+    return format
+
+
+def fit_batch(model, datasets, params, var_names='key',
+              kinds=('glance', 'tidy', 'augment'), warm_start=False,
+              n_jobs=None, executor=None, num_blocks=None, **fit_kws):
+    """Fit `model` to a collection of datasets and tidy the fit results.
+
+    Each dataset is fitted with `model.fit` and its results are tidied
+    right away with :func:`glance`, :func:`tidy` and/or :func:`augment`.
+    The fit result object is then discarded, so that memory usage
+    does not depend on holding all the fit results at once.
+    The returned DataFrames are the same returned by the pybroom
+    functions called on the collection of fit results.
+
+    Example::
+
+        >>> datasets = {'A': [y1, y2], 'B': [y3, y4]}
+        >>> out = br.fit_batch(model, datasets, params, x=x,
+        ...                    var_names=['sample', 'replicate'])
+        >>> out['glance']
+
+    Arguments:
+        model (lmfit.Model): the model to fit.
+        datasets (list or dict): collection of datasets. It can be a list,
+            a dict or a nested structure such as a dict of lists (like the
+            `results` argument of :func:`glance`). Each dataset is an
+            array of data or a tuple `(data, kws)`, where `kws` is a dict
+            of additional arguments for `model.fit` for this dataset
+            (e.g. independent variables or weights).
+        params (lmfit.Parameters): initial parameters for the fits.
+        var_names (string or list): name(s) of the "key" column(s)
+            identifying each dataset.
+        kinds (string or tuple of strings): which DataFrames to build, any
+            of 'glance', 'tidy' and 'augment'.
+        warm_start (bool): if True, each fit starts from the best-fit
+            parameters of the previous dataset (in iteration order) instead
+            of `params`. When fitting in parallel, the datasets are split
+            in contiguous blocks and the warm start happens within
+            each block.
+        n_jobs (int or None): number of worker processes, see :func:`tidy`.
+        executor (concurrent.futures.Executor or None): executor used to
+            run the fits, see :func:`tidy`.
+        num_blocks (int or None): number of blocks of datasets fitted in
+            parallel (one task each). If None, use `n_jobs` (the number of
+            CPUs when `n_jobs` is -1 or an `executor` is passed). Ignored
+            when fitting serially.
+        **fit_kws: additional arguments passed to `model.fit` for all the
+            datasets (e.g. the independent variable `x`).
+
+    Returns:
+        A DataFrame when `kinds` is a string, otherwise a dict of
+        DataFrames with keys `kinds`.
+    """
+    single_kind = isinstance(kinds, str)
+    kinds = _as_list_of_strings_copy(kinds)
+    for kind in kinds:
+        if kind not in _handlers:
+            msg = '`kinds` items should be in %s. Got %r.'
+            raise ValueError(msg % (sorted(_handlers), kind))
+    var_names = _as_list_of_strings_copy(var_names)
+    leaves = list(_iter_leaves(datasets, len(var_names)))
+    key_paths = [key_path for key_path, _, _ in leaves]
+    is_dict_paths = [is_dict_path for _, is_dict_path, _ in leaves]
+
+    _check_n_jobs(n_jobs)
+    if executor is None and n_jobs in (None, 1):
+        num_blocks = 1
+    elif num_blocks is None:
+        num_blocks = n_jobs
+        if executor is not None or n_jobs in (None, -1):
+            num_blocks = os.cpu_count()
+    elif num_blocks < 1:
+        raise ValueError('`num_blocks` should be a positive integer.')
+    num_blocks = max(1, min(num_blocks, len(leaves)))
+    bounds = np.linspace(0, len(leaves), num_blocks + 1).astype(int)
+    blocks = [[(dataset, var_names[len(key_path):])
+               for key_path, _, dataset in leaves[start:stop]]
+              for start, stop in zip(bounds[:-1], bounds[1:])]
+    fit_block = functools.partial(_fit_block, model=model, params=params,
+                                  kinds=kinds, warm_start=warm_start,
+                                  fit_kws=fit_kws)
+    block_frames = _map_leaves(fit_block, blocks, [None] * len(blocks),
+                               n_jobs=n_jobs, executor=executor)
+    leaf_frames = [frames for block in block_frames for frames in block]
+    out = OrderedDict()
+    for i, kind in enumerate(kinds):
+        out[kind] = _concat_frames([frames[i] for frames in leaf_frames],
+                                   var_names, key_paths, is_dict_paths)
+    return out[kinds[0]] if single_kind else out
+
+
+def _fit_block(block, _, model, params, kinds, warm_start, fit_kws):
+    """Fit and tidy a list of `(dataset, var_names)` (see `fit_batch`).
+
+    Returns a list with the DataFrames of each kind for each dataset.
+    """
+    tidy_funcs = {'tidy': tidy, 'glance': glance, 'augment': augment}
+    block_frames = []
+    for dataset, var_names in block:
+        kws = fit_kws
+        if isinstance(dataset, tuple):
+            dataset, dataset_kws = dataset
+            kws = dict(fit_kws, **dataset_kws)
+        result = model.fit(dataset, params, **kws)
+        block_frames.append([tidy_funcs[kind](result, var_names)
+                             for kind in kinds])
+        if warm_start:
+            params = result.params
+        del result
+    return block_frames
+
+
+class ResultSnapshot:
+    """Compact record of the data needed to tidy a fit result.
+
+    Instances are created by :func:`snapshot` and can be passed to
+    :func:`tidy`, :func:`glance` and :func:`augment` in place of the
+    original fit result, giving the same DataFrames.
+
+    Attributes:
+        result_type (string): name of the type of the original fit result.
+        tidy_data (OrderedDict): columns of the `tidy` DataFrame (for lmfit
+            results) or `x`, `grad`, `active_mask` arrays (for scipy
+            results).
+        glance_data (OrderedDict): values of the `glance` DataFrame.
+        augment_data (OrderedDict or None): columns of the `augment`
+            DataFrame (only for `lmfit.ModelResult`).
+    """
+    __slots__ = ('result_type', 'tidy_data', 'glance_data', 'augment_data',
+                 '__weakref__')
+
+    def __init__(self, result_type, tidy_data, glance_data,
+                 augment_data=None):
+        self.result_type = result_type
+        self.tidy_data = tidy_data
+        self.glance_data = glance_data
+        self.augment_data = augment_data
+
+    def __getstate__(self):
+        return (self.result_type, self.tidy_data, self.glance_data,
+                self.augment_data)
+
+    def __setstate__(self, state):
+        (self.result_type, self.tidy_data, self.glance_data,
+         self.augment_data) = state
+
+    def __repr__(self):
+        return '<ResultSnapshot of %s>' % self.result_type
+
+
+def snapshot(results, augment=True):
+    """Extract the data needed by pybroom from fit results.
+
+    Fit result objects (e.g. `lmfit.ModelResult`) hold references to the
+    data, the model, the minimizer, etc. This function copies only the
+    data needed by :func:`tidy`, :func:`glance` and :func:`augment` into a
+    compact :class:`ResultSnapshot` object, which is also cheap to
+    pickle. The pybroom functions accept these objects as input, for
+    example::
+
+        >>> snaps = br.snapshot(results)  # `results` can now be deleted
+        >>> br.glance(snaps)
+
+    Arguments:
+        results (fit result object, list or dict): one of the supported
+            fit result objects or a collection of them (also nested, see
+            :func:`glance`).
+        augment (bool): if True, the data for :func:`augment` (one row for
+            each data point) is also saved for `lmfit.ModelResult`
+            objects. Set it to False to save memory when `augment` is not
+            needed.
+
+    Returns:
+        A :class:`ResultSnapshot` or, if `results` is a collection, a
+        collection of :class:`ResultSnapshot` with the same structure.
+    """
+    if _is_collection(results):
+        if isinstance(results, dict):
+            return results.__class__(
+                (key, snapshot(res, augment)) for key, res in results.items())
+        return [snapshot(res, augment) for res in results]
+    result_type = type(results).__name__
+    if isinstance(results, ResultSnapshot):
+        return results
+    elif isinstance(results, so.OptimizeResult):
+        tidy_data = OrderedDict((name, np.asarray(results[name]))
+                                for name in ('x', 'grad', 'active_mask')
+                                if name in results)
+        return ResultSnapshot(result_type, tidy_data,
+                              _glance_scipy_values(results))
+    elif isinstance(results, _lmfit_result_types):
+        augment_data = None
+        if augment and isinstance(results, lmfit.model.ModelResult):
+            augment_data = OrderedDict(
+                (name, np.array(values))
+                for name, values in _augment_lmfit_columns(results).items())
+        return ResultSnapshot(result_type, _tidy_lmfit_columns(results),
+                              _glance_lmfit_values(results), augment_data)
+    msg = 'Sorry, `snapshot` does not support this object type (%s)'
+    raise NotImplementedError(msg % type(results))
+
+
+# Tidying function receiving each kind-specific keyword argument
+_kwargs_kinds = {'param_names': 'tidy', 'precision': 'augment'}
+
+
+class TidyAccumulator:
+    """Accumulate tidy DataFrames of fit results added one at a time.
+
+    Use this class when fit results become available over time (e.g. in a
+    monitoring loop). Each call to :meth:`add` tidies only the new fit
+    result and appends its rows to growable column buffers (with amortized
+    constant cost per row). The current DataFrames are returned by
+    :meth:`glance`, :meth:`tidy` and :meth:`augment` without
+    concatenating again the rows already accumulated.
+
+    Example::
+
+        >>> acc = br.TidyAccumulator(var_names=['sample', 'replicate'])
+        >>> for sample, replicate, result in fits_as_they_complete():
+        ...     acc.add((sample, replicate), result)
+        ...     dashboard.update(acc.glance())
+
+    Arguments:
+        var_names (string or list): name(s) of the "key" column(s)
+            identifying each fit result.
+        kinds (string or tuple of strings): which DataFrames to
+            accumulate, any of 'glance', 'tidy' and 'augment'.
+        **kwargs: additional arguments passed to the underlying specialized
+            tidying functions. `param_names` is passed only to 'tidy'
+            and `precision` only to 'augment'.
+    """
+    def __init__(self, var_names='key', kinds=('glance', 'tidy', 'augment'),
+                 **kwargs):
+        self.var_names = _as_list_of_strings_copy(var_names)
+        self.kinds = _as_list_of_strings_copy(kinds)
+        for kind in self.kinds:
+            if kind not in _handlers:
+                msg = '`kinds` items should be in %s. Got %r.'
+                raise ValueError(msg % (sorted(_handlers), kind))
+        self.kwargs = kwargs
+        self.num_results = 0
+        self._buffers = OrderedDict((kind, _ColumnBuffers())
+                                    for kind in self.kinds)
+
+    def __len__(self):
+        return self.num_results
+
+    def add(self, key_path, result):
+        """Tidy `result` and append its rows.
+
+        Arguments:
+            key_path (scalar or tuple): key(s) identifying `result`, one
+                for each item in `var_names`. A scalar is equivalent
+                to a 1-element tuple.
+            result (fit result object): the fit result to add.
+        """
+        if not isinstance(key_path, tuple):
+            key_path = (key_path,)
+        if len(key_path) != len(self.var_names):
+            msg = '`key_path` should have %d items (one for each var_names).'
+            raise ValueError(msg % len(self.var_names))
+        tidy_funcs = {'tidy': tidy, 'glance': glance, 'augment': augment}
+        # Tidy all the kinds before appending, so that an error leaves
+        # all the buffers unchanged
+        tidied = []
+        for kind in self._buffers:
+            df = tidy_funcs[kind](result, [], **self._kind_kwargs(kind))
+            columns = OrderedDict((name, df[name].to_numpy())
+                                  for name in df.columns)
+            for name, key in reversed(list(zip(self.var_names, key_path))):
+                columns[name] = np.full(len(df), key, dtype=np.asarray(
+                    [key]).dtype)
+            tidied.append((kind, columns, len(df)))
+        for kind, columns, num_rows in tidied:
+            self._buffers[kind].append(columns, num_rows)
+        self.num_results += 1
+
+    def _kind_kwargs(self, kind):
+        """Return the items of `kwargs` to be passed to tidy function `kind`.
+
+        Arguments known to be specific to one kind (see `_kwargs_kinds`)
+        are passed only to that kind, the others are passed to all kinds.
+        """
+        return {name: value for name, value in self.kwargs.items()
+                if _kwargs_kinds.get(name, kind) == kind}
+
+    def dataframe(self, kind, copy=False):
+        """Return the accumulated DataFrame of type `kind`.
+
+        Arguments:
+            kind (string): one of the `kinds` passed to the constructor.
+            copy (bool): if False, the returned DataFrame shares memory
+                with the accumulator buffers, and should not be modified
+                in place. Rows added later are not visible in it.
+        """
+        if kind not in self._buffers:
+            msg = '`%s` data is not accumulated (see argument `kinds`).'
+            raise ValueError(msg % kind)
+        return self._buffers[kind].to_dataframe(copy=copy)
+
+    def glance(self, copy=False):
+        """Return the accumulated `glance` DataFrame, see :meth:`dataframe`.
+        """
+        return self.dataframe('glance', copy=copy)
+
+    def tidy(self, copy=False):
+        """Return the accumulated `tidy` DataFrame, see :meth:`dataframe`.
+        """
+        return self.dataframe('tidy', copy=copy)
+
+    def augment(self, copy=False):
+        """Return the accumulated `augment` DataFrame, see :meth:`dataframe`.
+        """
+        return self.dataframe('augment', copy=copy)
+
+
+class _ColumnBuffers:
+    """Growable numpy buffers for the columns of a DataFrame.
+
+    The capacity doubles when full, so appending rows has amortized
+    constant cost. Columns missing in some appended rows are filled with
+    NaN (or None), promoting the column dtype when needed.
+    """
+    def __init__(self, capacity=16):
+        self.columns = OrderedDict()
+        self.size = 0
+        self.capacity = capacity
+
+    def append(self, columns, num_rows):
+        """Append `num_rows` rows from an OrderedDict of column arrays.
+        """
+        new_size = self.size + num_rows
+        if new_size > self.capacity:
+            self.capacity = max(2 * self.capacity, new_size)
+            for name, buf in self.columns.items():
+                self.columns[name] = self._resize(buf, self.capacity)
+        for name, values in columns.items():
+            if values.dtype.kind in 'US':
+                values = values.astype(object)
+            buf = self.columns.get(name)
+            if buf is None:
+                buf = self._new(values.dtype, self.size > 0)
+            if not np.can_cast(values.dtype, buf.dtype, casting='same_kind'):
+                buf = buf.astype(np.result_type(buf.dtype, values.dtype))
+            self.columns[name] = buf
+            buf[self.size:new_size] = values
+        for name, buf in self.columns.items():
+            if name not in columns:
+                buf = self.columns[name] = self._with_missing(buf)
+                buf[self.size:new_size] = _missing_value(buf.dtype)
+        self.size = new_size
+
+    def _new(self, dtype, with_missing):
+        buf = np.empty(self.capacity, dtype=dtype)
+        if with_missing:
+            buf = self._with_missing(buf)
+            buf[:self.size] = _missing_value(buf.dtype)
+        return buf
+
+    @staticmethod
+    def _with_missing(buf):
+        """Return `buf` converted to a dtype supporting missing values.
+        """
+        if buf.dtype.kind in 'iu':
+            return buf.astype(float)
+        elif buf.dtype.kind == 'b':
+            return buf.astype(object)
+        return buf
+
+    @staticmethod
+    def _resize(buf, capacity):
+        new_buf = np.empty(capacity, dtype=buf.dtype)
+        new_buf[:len(buf)] = buf
+        return new_buf
+
+    def to_dataframe(self, copy=False):
+        return pd.DataFrame(OrderedDict(
+            (name, buf[:self.size]) for name, buf in self.columns.items()),
+            copy=copy)
+
+
+def _missing_value(dtype):
+    """Value used for missing data in an array of type `dtype`.
+    """
+    return None if dtype.kind == 'O' else np.nan
+
+
+def _widened_columns(columns, new_columns, key_names):
+    """Return `columns` plus `new_columns`, inserted before the key columns.
+
+    This is the column order of the concatenation of DataFrames with
+    different columns, followed by the key columns (see :func:`augment`).
+    """
+    new_columns = [c for c in new_columns if c not in columns]
+    position = next((i for i, c in enumerate(columns) if c in key_names),
+                    len(columns))
+    return columns[:position] + new_columns + columns[position:]
+
+
+def _write_parquet(chunks, path, key_names):
+    """Write DataFrame `chunks` to a Parquet file, one row group per chunk.
+
+    When a chunk contains new columns (e.g. components of composite models
+    appearing after single-component models), the row groups already
+    written are copied to a new file with the widened schema, where the
+    new columns are null.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, schema = None, None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            for name in key_names:
+                if name in table.column_names:
+                    i = table.column_names.index(name)
+                    column = table.column(i).dictionary_encode()
+                    table = table.set_column(i, name, column)
+            # All-None columns (e.g. `expr`) are assumed to be strings
+            fields = OrderedDict(
+                (field.name, field.with_type(pa.string())
+                 if pa.types.is_null(field.type) else field)
+                for field in table.schema)
+            if schema is None:
+                schema = pa.schema(list(fields.values()))
+                writer = pq.ParquetWriter(path, schema)
+            elif not set(fields) <= set(schema.names):
+                old_fields = OrderedDict((f.name, f) for f in schema)
+                old_fields.update((name, field)
+                                  for name, field in fields.items()
+                                  if name not in old_fields)
+                names = _widened_columns(schema.names, list(fields),
+                                         key_names)
+                schema = pa.schema([old_fields[name] for name in names])
+                writer.close()
+                writer = _rewrite_parquet(path, schema)
+            writer.write_table(_conform_table(table, schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _conform_table(table, schema):
+    """Return `table` with the columns of `schema`, adding null columns.
+    """
+    import pyarrow as pa
+
+    columns = []
+    for field in schema:
+        if field.name not in table.column_names:
+            columns.append(pa.nulls(len(table), field.type))
+            continue
+        column = table.column(field.name)
+        if (pa.types.is_dictionary(field.type) and
+                not pa.types.is_dictionary(column.type)):
+            # Keys read back from the file are decoded
+            column = column.dictionary_encode()
+        columns.append(column.cast(field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _rewrite_parquet(path, schema):
+    """Copy the Parquet file `path` with a widened `schema`.
+
+    Row groups are copied one at a time. Returns a ParquetWriter open on
+    `path` to append further row groups.
+    """
+    import pyarrow.parquet as pq
+
+    old_path = path + '.tmp'
+    os.replace(path, old_path)
+    writer = pq.ParquetWriter(path, schema)
+    old_file = pq.ParquetFile(old_path)
+    for i in range(old_file.num_row_groups):
+        writer.write_table(_conform_table(old_file.read_row_group(i),
+                                          schema))
+    old_file.close()
+    os.remove(old_path)
+    return writer
+
+
+def _write_csv(chunks, path, key_names):
+    """Write DataFrame `chunks` to a CSV file.
+
+    When a chunk contains new columns, the rows already written are
+    copied (in chunks) to a new file with the widened header, where the
+    new columns are empty.
+    """
+    columns = None
+    for chunk in chunks:
+        if columns is None:
+            columns = list(chunk.columns)
+            chunk.to_csv(path, index=False)
+            continue
+        if not set(chunk.columns) <= set(columns):
+            columns = _widened_columns(columns, list(chunk.columns),
+                                       key_names)
+            old_path = path + '.tmp'
+            os.replace(path, old_path)
+            with open(path, 'w', newline='') as f:
+                pd.DataFrame(columns=columns).to_csv(f, index=False)
+                for old_chunk in pd.read_csv(old_path, chunksize=len(chunk),
+                                             dtype=str, keep_default_na=False):
+                    old_chunk.reindex(columns=columns).to_csv(
+                        f, header=False, index=False)
+            os.remove(old_path)
+        chunk.reindex(columns=columns).to_csv(path, mode='a', header=False,
+                                              index=False)
+
+
+class Profile:
+    """Time spent and rows produced in each step of pybroom calls.
+
+    Instances are created by :func:`profile`, see its documentation.
+
+    Attributes:
+        sections (OrderedDict): for each section name a dict with
+            the number of `calls`, the total `time` (seconds), and the
+            total `rows` and `nbytes` of the returned DataFrames.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.sections = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _record(self, section, elapsed, output):
+        rows = nbytes = 0
+        if isinstance(output, pd.DataFrame):
+            rows = len(output)
+            nbytes = int(output.memory_usage(index=False).sum())
+        with self._lock:
+            stats = self.sections.setdefault(
+                section, dict(calls=0, time=0., rows=0, nbytes=0))
+            stats['calls'] += 1
+            stats['time'] += elapsed
+            stats['rows'] += rows
+            stats['nbytes'] += nbytes
+        if self.callback is not None:
+            self.callback(section, elapsed, rows, nbytes)
+
+    def to_dataframe(self):
+        """Return the profile data as a DataFrame (one row per section).
+        """
+        with self._lock:
+            data = [dict(section=section, **stats)
+                    for section, stats in self.sections.items()]
+        columns = ['section', 'calls', 'time', 'rows', 'nbytes']
+        return pd.DataFrame(data, columns=columns)
+
+
+# Active `Profile` instances (see `profile`)
+_profilers = []
+
+
+@contextlib.contextmanager
+def profile(callback=None):
+    """Context manager profiling pybroom calls in the `with` block.
+
+    The time spent in each of the following sections of :func:`tidy`,
+    :func:`glance` and :func:`augment` is accumulated:
+
+    - `dispatch`: finding the specialized function for a fit result.
+    - `extract:<kind>:<type>`: tidying a single fit result, for example
+      `extract:augment:ModelResult` is a call of
+      :func:`_augment_lmfit_modelresult`.
+    - `evaluate`: evaluating the model components (in `augment`).
+    - `concat`: concatenating the DataFrames of a collection of results.
+    - `keys`: building and adding the "key" columns.
+
+    Sections are nested (e.g. `evaluate` time is also counted in
+    `extract:augment:ModelResult`). For sections returning a DataFrame,
+    number of rows and bytes are also accumulated.
+    Fit results tidied in worker processes (`n_jobs` argument)
+    are not profiled.
+
+    Example::
+
+        >>> with pybroom.profile() as prof:
+        ...     df = pybroom.augment(results)
+        >>> prof.to_dataframe()
+
+    Arguments:
+        callback (callable or None): if not None, function called as
+            `callback(section, elapsed, rows, nbytes)` after each
+            profiled section.
+
+    Returns:
+        A :class:`Profile` object collecting the profile data.
+    """
+    profiler = Profile(callback)
+    _profilers.append(profiler)
+    try:
+        yield profiler
+    finally:
+        _profilers.remove(profiler)
+
+
+def _profiled_call(section, func, *args, **kwargs):
+    """Call `func(*args, **kwargs)`, timing it when profiling is active.
+
+    `section` is a string or a tuple of strings, joined with ':' only
+    when profiling is active.
+    """
+    if not _profilers:
+        return func(*args, **kwargs)
+    t0 = time.perf_counter()
+    output = func(*args, **kwargs)
+    elapsed = time.perf_counter() - t0
+    if isinstance(section, tuple):
+        section = ':'.join(section)
+    for profiler in list(_profilers):
+        profiler._record(section, elapsed, output)
+    return output
+
+
+CacheInfo = namedtuple('CacheInfo',
+                       'hits misses evictions entries rows nbytes')
+
+
+class ResultCache:
+    """LRU cache of the DataFrames tidied from single fit results.
+
+    Pass an instance of this class to :func:`tidy`, :func:`glance` or
+    :func:`augment` (argument `cache`) to reuse the per-result DataFrames
+    computed in previous calls. When tidying a collection where only a few
+    fit results have been added or changed, only these are tidied again.
+
+    Entries are keyed by the tidying function, the identity of the fit
+    result and the additional tidying arguments. A cheap fingerprint of
+    the fit result (e.g. number of function evaluations, chi-square,
+    fitted values) is also stored, so that fit results modified in place
+    (e.g. re-fitted) are detected and tidied again.
+    The cache does not keep fit results alive: entries are
+    removed when the fit result is garbage collected.
+
+    Arguments:
+        max_rows (int or None): max total number of rows in the cached
+            DataFrames. Least recently used entries are evicted first.
+        max_bytes (int or None): max total memory (in bytes) used by the
+            cached DataFrames.
+    """
+    def __init__(self, max_rows=None, max_bytes=None):
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._refs = {}
+        self._hits = self._misses = self._evictions = 0
+        self._rows = self._nbytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cache_info(self):
+        """Return a `CacheInfo` namedtuple with the cache statistics.
+        """
+        return CacheInfo(self._hits, self._misses, self._evictions,
+                         len(self._entries), self._rows, self._nbytes)
+
+    def clear(self):
+        """Remove all the entries and reset the statistics.
+        """
+        self._entries.clear()
+        self._refs.clear()
+        self._hits = self._misses = self._evictions = 0
+        self._rows = self._nbytes = 0
+
+    def get(self, func, result, **kwargs):
+        """Return the cached DataFrame for `func(result, **kwargs)` or None.
+        """
+        key = _cache_key(func, result, kwargs)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != _fingerprint(result):
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, func, result, df, **kwargs):
+        """Store the DataFrame `df` returned by `func(result, **kwargs)`.
+        """
+        result_id = id(result)
+        if result_id not in self._refs:
+            try:
+                self._refs[result_id] = weakref.ref(
+                    result, functools.partial(self._remove_result, result_id))
+            except TypeError:
+                return  # object not weak-referenceable, do not cache
+        key = _cache_key(func, result, kwargs)
+        self._pop(key)
+        self._entries[key] = (_fingerprint(result), df,
+                              len(df), int(df.memory_usage(deep=True).sum()))
+        self._rows += len(df)
+        self._nbytes += self._entries[key][3]
+        self._evict()
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= entry[2]
+            self._nbytes -= entry[3]
+        return entry
+
+    def _evict(self):
+        def over_budget():
+            return ((self.max_rows is not None and
+                     self._rows > self.max_rows) or
+                    (self.max_bytes is not None and
+                     self._nbytes > self.max_bytes))
+        while self._entries and over_budget():
+            self._pop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove_result(self, result_id, ref=None):
+        self._refs.pop(result_id, None)
+        for key in [k for k in self._entries if k[1] == result_id]:
+            self._pop(key)
+
+
+def _cache_key(func, result, kwargs):
+    """Key for a :class:`ResultCache` entry.
+    """
+    return (func.__name__, id(result), repr(sorted(kwargs.items())))
+
+
+def _fingerprint(result):
+    """A cheap fingerprint of a fit result to detect in-place changes.
+    """
+    attrs = tuple(getattr(result, name, None)
+                  for name in ('nfev', 'chisqr', 'cost', 'success'))
+    if hasattr(result, 'params'):
+        values = tuple(p.value for p in result.params.values())
+    else:
+        values = np.asarray(getattr(result, 'x', ())).tobytes()
+    return attrs + (values,)
+
+
 def _as_odict_copy(results):
     """Transform input into a OrderedDict, if needed. Returns a copy.
     """
@@ -243,16 +2368,157 @@ def _as_list_of_strings_copy(var_names):
     """
     if isinstance(var_names, str):
         var_names = [var_names]
-    return var_names.copy()
+    return list(var_names)
+
+
+def _float_array(values):
+    """Build a float64 array from an iterable, mapping None to NaN.
+    """
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _is_collection(results):
+    """Return True if `results` is a list/dict of results (not a leaf).
+
+    Note that `scipy.optimize.OptimizeResult` is a dict subclass but it is
+    a single fit result (i.e. a leaf of the `results` tree).
+    """
+    return (isinstance(results, (list, dict)) and
+            not isinstance(results, so.OptimizeResult))
 
 
-def _multi_dataframe(func, results, var_names, **kwargs):
-    """Recursively call `func` on each item in `results` and concatenate output.
+def _iter_leaves(results, num_levels, _key_path=(), _is_dict_path=()):
+    """Walk the `results` tree yielding one tuple for each fit result.
+
+    Arguments:
+        results (dict or list): collection of fit results. It can be a list,
+            a dict or a nested structure such as a dict of lists.
+        num_levels (int): max nesting depth allowed (i.e. number of
+            `var_names`).
+
+    Yields:
+        Tuples `(key_path, is_dict_path, result)` where `key_path` is a
+        tuple of keys (one per nesting level) identifying `result` and
+        `is_dict_path` is a tuple of bools, True when the keys at the
+        corresponding level come from a dict.
+    """
+    if len(_key_path) == num_levels:
+        msg = ('The list `var_names` is too short. Its length should be equal '
+               'to the nesting levels in `results`.')
+        raise ValueError(msg)
+    is_dict = isinstance(results, dict)
+    for key, res in _as_odict_copy(results).items():
+        key_path = _key_path + (key,)
+        is_dict_path = _is_dict_path + (is_dict,)
+        if _is_collection(res):
+            yield from _iter_leaves(res, num_levels, key_path, is_dict_path)
+        else:
+            yield key_path, is_dict_path, res
+
+
+def _key_columns(var_names, key_paths, is_dict_paths, lengths,
+                 categorical='dict'):
+    """Build the "key" columns for a flattened `results` tree.
+
+    Arguments:
+        var_names (list of strings): names of the key columns, one for each
+            nesting level.
+        key_paths (list of tuples): keys identifying each fit result.
+        is_dict_paths (list of tuples): for each fit result, whether the
+            keys at each level come from a dict (see :func:`_iter_leaves`).
+        lengths (array of ints): number of rows for each fit result.
+        categorical (string or None): which key columns are
+            `pandas.Categorical`. If 'dict', only levels whose containers
+            are all dicts. If 'all', all the levels (also list indexes).
+            If None, no level.
+
+    Returns:
+        An OrderedDict of key columns, innermost nesting level first.
+    """
+    num_levels = max(len(path) for path in key_paths)
+    columns = OrderedDict()
+    for level in reversed(range(num_levels)):
+        keys = [path[level] if level < len(path) else None
+                for path in key_paths]
+        is_dict = all(path[level] for path in is_dict_paths
+                      if level < len(path))
+        if categorical == 'all' or (categorical == 'dict' and is_dict):
+            # Repeat the codes, not the keys, to avoid object arrays
+            keys = pd.Categorical(keys, ordered=True)
+            values = pd.Categorical.from_codes(
+                np.repeat(keys.codes, lengths), categories=keys.categories,
+                ordered=True)
+        else:
+            values = pd.Series(keys).repeat(lengths).values
+        columns[var_names[level]] = values
+    return columns
+
+
+_worker_state = {}
+
+
+def _init_worker(func, results, var_names):
+    """Store the pool-wide state in a worker process (see `_map_leaves`).
+    """
+    _worker_state.update(func=func, results=results, var_names=var_names)
+
+
+def _call_worker(index):
+    """Call the worker's `func` on the fit result number `index`.
+    """
+    state = _worker_state
+    return state['func'](state['results'][index], state['var_names'][index])
+
+
+def _check_n_jobs(n_jobs):
+    """Raise ValueError if `n_jobs` is not None, -1 or a positive int.
+    """
+    if n_jobs is None or n_jobs == -1:
+        return
+    if (isinstance(n_jobs, bool) or
+            not isinstance(n_jobs, (int, np.integer)) or n_jobs < 1):
+        msg = ('`n_jobs` should be None, -1 (one process per CPU) or a '
+               'positive integer. Got %r.')
+        raise ValueError(msg % (n_jobs,))
+
+
+def _map_leaves(func, results, var_names, n_jobs=None, executor=None):
+    """Call `func(result, var_names)` for each pair in `results, var_names`.
+
+    Calls are distributed on `executor` or, when `n_jobs` is not None or 1,
+    on a new process pool with `n_jobs` workers. The returned list
+    of outputs has always the same order of the input `results`.
+
+    The process pool receives the fit results once, at worker
+    initialization, and then only the indexes of the results to tidy.
+    With the "fork" start method (default on Linux) the results are
+    inherited by the workers without pickling, so also fit results
+    which cannot be pickled (e.g. `ModelResult` of composite models)
+    are supported.
+    """
+    _check_n_jobs(n_jobs)
+    if executor is None and n_jobs in (None, 1):
+        return [func(res, names) for res, names in zip(results, var_names)]
+    if executor is not None:
+        return list(executor.map(func, results, var_names))
+    if n_jobs == -1:
+        n_jobs = os.cpu_count()
+    chunksize = max(1, len(results) // (4 * n_jobs))
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker,
+                             initargs=(func, results, var_names)) as pool:
+        return list(pool.map(_call_worker, range(len(results)),
+                             chunksize=chunksize))
+
+
+def _multi_dataframe(func, results, var_names, n_jobs=None, executor=None,
+                     categorical_keys='dict', cache=None, **kwargs):
+    """Call `func` on each item in `results` and concatenate output.
 
     Usually `func` is :func:`glance`, :func:`tidy` or :func:`augment`.
-    The function `func` is also the calling function, therefore this implements
-    a recursion which unpacks the nested `results` structure (a tree) and
-    builds a global tidy DataFrame with "key" columns corresponding to
+    The nested `results` structure (a tree) is first flattened into a list
+    of fit results (the leaves) and their key paths. `func` is called on
+    each leaf, and the resulting DataFrames are concatenated once into a
+    global tidy DataFrame with "key" columns corresponding to
     the `results` structure.
 
     Arguments:
@@ -260,10 +2526,20 @@ def _multi_dataframe(func, results, var_names, **kwargs):
             Chose between `glance`, `tidy` or `augment`.
         results (dict or list): collection of fit results. It can be a list,
             a dict or a nested structure such as a dict of lists.
+            Items can also be `concurrent.futures.Future` objects
+            resolving to fit results: these are tidied in completion order.
         var_names (list or string): names of DataFrame columns used to index
             the results. It can be a list of strings or single string in case
             only one categorical "index" is needed (i.e. a string is equivalent
             to a 1-element list of strings).
+        n_jobs (int or None): number of worker processes. See :func:`tidy`.
+        executor (concurrent.futures.Executor or None): executor used to
+            call `func` on the fit results. See :func:`tidy`.
+        categorical_keys (string or None): which "key" columns are
+            converted to `pandas.Categorical`: 'dict' (default) for the
+            levels built from dicts, 'all' for all the levels.
+        cache (ResultCache or None): cache of per-result DataFrames.
+            Only fit results not found in the cache are tidied.
 
     Returns:
         "Tidy" DataFrame merging data from all the items in `results`.
@@ -272,23 +2548,264 @@ def _multi_dataframe(func, results, var_names, **kwargs):
     """
     if isinstance(results, so.OptimizeResult):
         raise ValueError('Input argument has wrong type: `OptimizeResult`.')
+    var_names = _as_list_of_strings_copy(var_names)
+    leaves = list(_iter_leaves(results, len(var_names)))
+    key_paths = [key_path for key_path, _, _ in leaves]
+    is_dict_paths = [is_dict_path for _, is_dict_path, _ in leaves]
+    leaf_results = [res for _, _, res in leaves]
+    leaf_var_names = [var_names[len(key_path):] for key_path in key_paths]
+    if cache is None:
+        batch = _scipy_batch_frame(func, leaf_results, kwargs)
+        if batch is not None:
+            df, lengths = batch
+            return _add_key_columns(df, lengths, var_names, key_paths,
+                                    is_dict_paths,
+                                    categorical=categorical_keys)
+    # The same future can be at several positions: map it to all of them
+    futures = OrderedDict()
+    for i, res in enumerate(leaf_results):
+        if isinstance(res, Future):
+            futures.setdefault(res, []).append(i)
+    is_future = [isinstance(res, Future) for res in leaf_results]
+    frames = [None] * len(leaves)
+    if cache is not None:
+        frames = [None if is_future[i] else cache.get(func, res, **kwargs)
+                  for i, res in enumerate(leaf_results)]
+    missing = [i for i, frame in enumerate(frames)
+               if frame is None and not is_future[i]]
+    new_frames = _map_leaves(functools.partial(func, **kwargs),
+                             [leaf_results[i] for i in missing],
+                             [leaf_var_names[i] for i in missing],
+                             n_jobs=n_jobs, executor=executor)
+    for i, frame in zip(missing, new_frames):
+        frames[i] = frame
+        if cache is not None:
+            cache.put(func, leaf_results[i], frame, **kwargs)
+    # Tidy the results of futures in completion order
+    for future in as_completed(futures):
+        for i in futures[future]:
+            frames[i] = _tidy_cached(func, future.result(),
+                                     leaf_var_names[i], cache, kwargs)
+    return _concat_frames(frames, var_names, key_paths, is_dict_paths,
+                          categorical=categorical_keys)
+
+
+def _scipy_batch_frame(func, results, kwargs):
+    """Tidy a list of `scipy.optimize.OptimizeResult` in a vectorized way.
+
+    Arrays of all the fit results (e.g. `x`, `grad`) are stacked in 2-D
+    arrays, and the DataFrame for all the fit results is built at once.
+
+    Returns:
+        A tuple (DataFrame, array of number of rows for each fit result),
+        or None if `results` are not all `OptimizeResult` handled by the
+        built-in functions or cannot be stacked (e.g. different number
+        of parameters or different attributes).
+    """
+    if len(results) == 0:
+        return None
+    if func is tidy:
+        builtin = _tidy_scipy
+    elif func is glance:
+        builtin = glance_scipy_result
+    else:
+        return None
+    if not all(isinstance(res, so.OptimizeResult) and
+               _find_handler(func.__name__, res) is builtin
+               for res in results):
+        return None
+    if func is glance:
+        return _glance_scipy_batch(results)
+    if 'param_names' not in kwargs:
+        return None  # let `tidy` raise the error
+    return _tidy_scipy_batch(results, **kwargs)
+
+
+def _tidy_scipy_batch(results, param_names, key='name', value='value',
+                      keys_exclude=None):
+    """Vectorized :func:`tidy_scipy_result` for a list of results.
+    """
+    plan = _scipy_plan(param_names)
+    num_params = len(plan.fields)
+    if any(np.size(res.x) != num_params for res in results):
+        return None
+    names, index = _plan_rows(plan, keys_exclude)
+    columns = OrderedDict([
+        (key, np.tile(np.array(names, dtype=object), len(results))),
+        (value, np.vstack([res.x for res in results])[:, index].ravel()),
+    ])
+    for var in ('grad', 'active_mask'):
+        has_var = [var in res for res in results]
+        if any(has_var) and not all(has_var):
+            return None
+        if all(has_var):
+            stacked = np.vstack([np.asarray(res[var]) for res in results])
+            columns[var] = stacked[:, index].ravel()
+    lengths = np.full(len(results), len(names), dtype=int)
+    return pd.DataFrame(columns), lengths
+
+
+def _glance_scipy_batch(results):
+    """Vectorized :func:`glance_scipy_result` for a list of results.
+    """
+    values = [_glance_scipy_values(res) for res in results]
+    names = list(values[0])
+    if any(list(v) != names for v in values):
+        return None
+    columns = OrderedDict(
+        (name, np.array([v[name] for v in values])) for name in names)
+    for name, column in columns.items():
+        if column.dtype.kind in 'US':
+            columns[name] = column.astype(object)
+    return pd.DataFrame(columns), np.ones(len(results), dtype=int)
+
+
+def _tidy_cached(func, result, var_names, cache, kwargs):
+    """Return `func(result, var_names, **kwargs)`, using `cache` if not None.
+    """
+    if cache is None:
+        return func(result, var_names, **kwargs)
+    frame = cache.get(func, result, **kwargs)
+    if frame is None:
+        frame = func(result, var_names, **kwargs)
+        cache.put(func, result, frame, **kwargs)
+    return frame
+
+
+async def _multi_dataframe_async(func, results, var_names,
+                                 categorical_keys='dict', **kwargs):
+    """Async version of :func:`_multi_dataframe` for awaitable fit results.
+
+    Awaitable items in `results` are awaited concurrently and each fit
+    result is tidied as soon as it is available.
+    """
+    var_names = _as_list_of_strings_copy(var_names)
+    leaves = list(_iter_leaves(results, len(var_names)))
+    key_paths = [key_path for key_path, _, _ in leaves]
+    is_dict_paths = [is_dict_path for _, is_dict_path, _ in leaves]
+    leaf_var_names = [var_names[len(key_path):] for key_path in key_paths]
+    frames = [None] * len(leaves)
+    pending = {}  # task -> list of positions in `leaves`
+    for i, (_, _, res) in enumerate(leaves):
+        if inspect.isawaitable(res):
+            pending.setdefault(asyncio.ensure_future(res), []).append(i)
+        else:
+            frames[i] = func(res, leaf_var_names[i], **kwargs)
+    while pending:
+        done, _ = await asyncio.wait(pending,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            for i in pending.pop(task):
+                frames[i] = func(task.result(), leaf_var_names[i], **kwargs)
+    return _concat_frames(frames, var_names, key_paths, is_dict_paths,
+                          categorical=categorical_keys)
+
+
+def _concat_frames(frames, var_names, key_paths, is_dict_paths,
+                   categorical='dict'):
+    """Concatenate the DataFrames of a flattened `results` tree.
+
+    Arguments:
+        frames (list of DataFrames): the DataFrame of each fit result.
+        var_names, key_paths, is_dict_paths, categorical: arguments
+            used to build the "key" columns, see :func:`_key_columns`.
+
+    Returns:
+        The concatenated DataFrame with "key" columns.
+    """
+    lengths = np.array([len(frame) for frame in frames], dtype=int)
+    df = _profiled_call('concat', pd.concat, frames, ignore_index=True)
+    return _add_key_columns(df, lengths, var_names, key_paths, is_dict_paths,
+                            categorical=categorical)
+
+
+def _add_key_columns(df, lengths, var_names, key_paths, is_dict_paths,
+                     categorical='dict'):
+    """Return `df` with the "key" columns (see :func:`_key_columns`).
+    """
+    def add_keys():
+        key_columns = _key_columns(var_names, key_paths, is_dict_paths,
+                                   lengths, categorical=categorical)
+        return df.assign(**key_columns)
+    return _profiled_call('keys', add_keys)
+
+
+def _iter_key_results(results):
+    """Yield `(key, result, is_dict)` for each item in the iterable `results`.
+
+    `results` can be a dict, a list or any iterable of fit results or of
+    `(key, result)` pairs.
+    """
+    if isinstance(results, dict):
+        for key, res in results.items():
+            yield key, res, True
+        return
+    for i, item in enumerate(results):
+        if isinstance(item, tuple) and len(item) == 2:
+            yield item[0], item[1], True
+        else:
+            yield i, item, False
+
+
+def _iter_lazy_leaves(results, num_levels):
+    """Like :func:`_iter_leaves` for any iterable `results`.
+
+    See :func:`_iter_key_results` for the supported `results`.
+    """
+    for key, res, is_dict in _iter_key_results(results):
+        if _is_collection(res):
+            yield from _iter_leaves(res, num_levels, (key,), (is_dict,))
+        else:
+            yield (key,), (is_dict,), res
+
+
+def _iter_dataframes(func, results, var_names, chunksize, **kwargs):
+    """Lazily call `func` on each item in `results` and yield chunks.
+
+    This is the streaming version of :func:`_multi_dataframe`, see
+    :func:`iter_augment` for a description of the arguments.
+    """
+    if isinstance(results, so.OptimizeResult):
+        raise ValueError('Input argument has wrong type: `OptimizeResult`.')
+    if chunksize < 1:
+        raise ValueError('`chunksize` must be a positive integer.')
+    var_names = _as_list_of_strings_copy(var_names)
     if len(var_names) == 0:
         msg = ('The list `var_names` is too short. Its length should be equal '
                'to the nesting levels in `results`.')
         raise ValueError(msg)
-    d = _as_odict_copy(results)
-    var_names = _as_list_of_strings_copy(var_names)
-    var_name = var_names.pop(0)
-    for i, (key, res) in enumerate(d.items()):
-        d[key] = func(res, var_names, **kwargs)
-        d[key][var_name] = key
-    df = pd.concat(d, ignore_index=True)
-    # Convert "key" column to categorical only if input was dict-type
-    # not list/tuple.
-    if isinstance(results, dict):
-        kw = {var_name: lambda x: pd.Categorical(x[var_name], ordered=True)}
-        df = df.assign(**kw)
-    return df
+
+    def keyed_frame(buffer):
+        key_paths, is_dict_paths, frames = zip(*buffer)
+        return _concat_frames(frames, var_names, key_paths, is_dict_paths,
+                              categorical=None)
+
+    start = 0
+    carry = []  # keyed rows not yet returned
+    buffer, num_rows = [], 0
+    for key_path, is_dict_path, res in _iter_lazy_leaves(results,
+                                                         len(var_names)):
+        frame = func(res, var_names[len(key_path):], **kwargs)
+        buffer.append((key_path, is_dict_path, frame))
+        num_rows += len(frame)
+        if num_rows < chunksize:
+            continue
+        df = pd.concat(carry + [keyed_frame(buffer)], ignore_index=True)
+        buffer = []
+        num_full = len(df) // chunksize
+        for i in range(num_full):
+            chunk = df.iloc[i * chunksize:(i + 1) * chunksize]
+            chunk.index = pd.RangeIndex(start, start + chunksize)
+            start += chunksize
+            yield chunk
+        carry = [df.iloc[num_full * chunksize:]]
+        num_rows = len(carry[0])
+    if buffer:
+        carry.append(keyed_frame(buffer))
+    if carry and num_rows > 0:
+        df = pd.concat(carry, ignore_index=True)
+        df.index = pd.RangeIndex(start, start + len(df))
+        yield df
 
 
 def tidy_lmfit_result(result):
@@ -316,16 +2833,70 @@ def tidy_lmfit_result(result):
         - `expr` (string): constraint expression for the parameter.
         - `stderr` (float): standard error for the parameter.
     """
-    params_attrs = ['name', 'value', 'min', 'max', 'vary', 'expr', 'stderr']
-    columns = params_attrs + ['init_value']
-    d = pd.DataFrame(index=range(result.nvarys), columns=columns)
-    for i, (name, param) in enumerate(sorted(result.params.items())):
-        for p in params_attrs:
-            d.loc[i, p] = getattr(param, p)
-        # Derived parameters may not have init value
-        if name in result.init_values:
-            d.loc[i, 'init_value'] = result.init_values[name]
-    return d.apply(pd.to_numeric, errors='ignore')
+    return pd.DataFrame(_tidy_lmfit_columns(result))
+
+
+def _tidy_lmfit_columns(result):
+    """Return the columns of :func:`tidy_lmfit_result` as an OrderedDict.
+    """
+    plan = _tidy_plan(type(result), tuple(result.params))
+    params = [result.params[name] for name in plan.names]
+    init_values = result.init_values
+    columns = OrderedDict([('name', list(plan.names))])
+    for column, (getter, dtype) in _tidy_lmfit_getters.items():
+        values = [getter(p) for p in params]
+        if dtype is not None:
+            values = np.array(values, dtype=dtype)
+        columns[column] = values
+    # Derived parameters may not have init value
+    columns['init_value'] = _float_array(init_values.get(name)
+                                         for name in plan.names)
+    return columns
+
+
+# Columns of `tidy_lmfit_result` from `lmfit.Parameter` attributes:
+# column name -> (getter, dtype), dtype None for object columns (lists)
+_tidy_lmfit_getters = OrderedDict([
+    ('value', (operator.attrgetter('value'), float)),
+    ('min', (operator.attrgetter('min'), float)),
+    ('max', (operator.attrgetter('max'), float)),
+    ('vary', (operator.attrgetter('vary'), bool)),
+    ('expr', (operator.attrgetter('expr'), None)),
+    ('stderr', (operator.attrgetter('stderr'), float)),
+])
+
+_TidyPlan = namedtuple('_TidyPlan', ['fields', 'names', 'index'])
+_TidyPlan.__doc__ = """Extraction plan for fit results with the same params.
+
+Fields:
+    fields (tuple): parameter names in the order of the fit result.
+    names (tuple): parameter names sorted (i.e. the order of the rows).
+    index (array of int): position in `fields` of each name in `names`.
+"""
+
+
+@functools.lru_cache(maxsize=1024)
+def _tidy_plan(result_type, fields):
+    """Return the :class:`_TidyPlan` for `result_type` with params `fields`.
+
+    Plans are cached, so that fit results of the same type and with the
+    same parameters reuse the same plan.
+    """
+    names = tuple(sorted(fields))
+    position = {name: i for i, name in enumerate(fields)}
+    index = np.array([position[name] for name in names], dtype=int)
+    index.flags.writeable = False
+    return _TidyPlan(fields, names, index)
+
+
+def _plan_rows(plan, keys_exclude=None):
+    """Return (names, index) of the rows of `plan` not in `keys_exclude`.
+    """
+    if not keys_exclude:
+        return plan.names, plan.index
+    keep = [i for i, name in enumerate(plan.names)
+            if name not in keys_exclude]
+    return tuple(plan.names[i] for i in keep), plan.index[keep]
 
 
 def tidy_scipy_result(result, param_names, **kwargs):
@@ -356,13 +2927,34 @@ def tidy_scipy_result(result, param_names, **kwargs):
         - `grad` (float): gradient for each parameter
         - `active_mask` (int)
     """
-    Params = namedtuple('Params', param_names)
-    params = Params(*result.x)
-    df = dict_to_tidy(params._asdict(), **kwargs)
+    plan = _scipy_plan(param_names)
+    x = np.asarray(result.x)
+    if x.size != len(plan.fields):
+        msg = 'Got %d `param_names` for %d fitted parameters.'
+        raise TypeError(msg % (len(plan.fields), x.size))
+    names, index = _plan_rows(plan, kwargs.get('keys_exclude'))
+    # Rows are sorted by name, reorder all the arrays accordingly
+    columns = OrderedDict([(kwargs.get('key', 'name'), list(names)),
+                           (kwargs.get('value', 'value'), x[index])])
     for var in ('grad', 'active_mask'):
         if hasattr(result, var):
-            df[var] = result[var]
-    return df
+            columns[var] = np.asarray(result[var])[index]
+    return pd.DataFrame(columns)
+
+
+def _scipy_plan(param_names):
+    """Return the :class:`_TidyPlan` of `OptimizeResult` for `param_names`.
+    """
+    if not isinstance(param_names, str):
+        param_names = tuple(param_names)
+    return _scipy_plan_cached(param_names)
+
+
+@functools.lru_cache(maxsize=128)
+def _scipy_plan_cached(param_names):
+    # Parse and validate the names as namedtuple fields
+    fields = namedtuple('Params', param_names)._fields
+    return _tidy_plan(so.OptimizeResult, fields)
 
 
 def glance_scipy_result(result):
@@ -391,15 +2983,33 @@ def glance_scipy_result(result):
         - `status` (int): status returned by the fit routine
         - `message` (string): message returned by the fit routine
     """
-    attr_names_all = ['success', 'cost', 'optimality', 'nfev', 'njev', 'nit'
+    return _one_row_frame(_glance_scipy_values(result))
+
+
+def _glance_scipy_values(result):
+    """Return the values of :func:`glance_scipy_result` as an OrderedDict.
+    """
+    attr_names_all = ['success', 'cost', 'optimality', 'nfev', 'njev', 'nit',
                       'status', 'message']
-    attr_names = [a for a in attr_names_all if hasattr(result, a)]
+    values = OrderedDict((a, getattr(result, a)) for a in attr_names_all
+                         if hasattr(result, a))
     if hasattr(result, 'fun') and np.size(result.fun) == 1:
-        attr_names.append('fun')
-    d = pd.DataFrame(index=range(1), columns=attr_names)
-    for attr_name in attr_names:
-        d.loc[0, attr_name] = getattr(result, attr_name)
-    return d.apply(pd.to_numeric, errors='ignore')
+        values['fun'] = np.ravel(result.fun)[0]
+    return values
+
+
+def _one_row_frame(values):
+    """Build a 1-row DataFrame from an OrderedDict of scalar `values`.
+    """
+    return pd.DataFrame(OrderedDict((k, [v]) for k, v in values.items()))
+
+
+# Map of lmfit result attributes to `glance` column names
+_glance_lmfit_attrs = OrderedDict([
+    ('method', 'method'), ('nvarys', 'num_params'),
+    ('ndata', 'num_data_points'), ('chisqr', 'chisqr'), ('redchi', 'redchi'),
+    ('aic', 'AIC'), ('bic', 'BIC'), ('nfev', 'num_func_eval'),
+    ('success', 'success'), ('message', 'message')])
 
 
 def glance_lmfit_result(result):
@@ -432,56 +3042,96 @@ def glance_lmfit_result(result):
           for the fit.
 
     """
-    def _is_modelresult(res):
-        return hasattr(res, 'model')
-    result_attrs = ['name', 'method', 'nvarys', 'ndata', 'chisqr', 'redchi',
-                    'aic', 'bic', 'nfev', 'success', 'message']
-    attrs_map = OrderedDict((n, n) for n in result_attrs)
-    attrs_map['name'] = 'model'
-    attrs_map['aic'] = 'AIC'
-    attrs_map['bic'] = 'BIC'
-    attrs_map['nvarys'] = 'num_params'
-    attrs_map['nfev'] = 'num_func_eval'
-    attrs_map['ndata'] = 'num_data_points'
+    return _one_row_frame(_glance_lmfit_values(result))
+
+
+def _glance_lmfit_values(result):
+    """Return the values of :func:`glance_lmfit_result` as an OrderedDict.
+    """
+    values = OrderedDict()
     # ModelResult has attribute `.model.name`, MinimizerResult does not
-    if not _is_modelresult(result):
-        attrs_map.pop('name')
-    d = pd.DataFrame(index=range(1), columns=attrs_map.values())
-    if _is_modelresult(result):
-        d.loc[0, attrs_map.pop('name')] = result.model.name
-    for attr_name, df_name in attrs_map.items():
-        d.loc[0, df_name] = getattr(result, attr_name)
-    #d.loc[0, 'num_components'] = len(result.components)
+    if hasattr(result, 'model'):
+        values['model'] = result.model.name
+    for attr_name, df_name in _glance_lmfit_attrs.items():
+        values[df_name] = getattr(result, attr_name)
     if hasattr(result, 'kws') and result.kws is not None:
         for key, value in result.kws.items():
-            d['_'.join((result.method, key))] = value
-    return d.apply(pd.to_numeric, errors='ignore')
+            values['_'.join((result.method, key))] = value
+    return values
 
 
-def _augment_lmfit_modelresult(result):
+def _augment_lmfit_modelresult(result, precision=None):
     """Tidy data values and fitted model from `lmfit.model.ModelResult`.
+
+    The returned DataFrame has one row for each data point and the columns:
+
+    - the independent variable(s): a column named `x` when the model has
+      only one independent variable, otherwise one column for each
+      independent variable (named as the variable).
+      Independent variables with size different than the
+      number of data points (e.g. options of the model function)
+      are not included.
+    - `data`, `best_fit` and `residual`.
+    - the value of each component (only for composite models), with
+      column names equal to the component names.
+
+    Columns are not copied when the input arrays are already 1-D.
+    If `precision` is not None (e.g. `'float32'`), float columns are
+    converted to this dtype.
     """
-    columns = ['x', 'data', 'best_fit', 'residual']
-    d = pd.DataFrame(index=range(result.ndata), columns=columns)
-    for col in columns[1:]:
-        d.loc[:, col] = getattr(result, col)
+    columns = _augment_lmfit_columns(result)
+    return pd.DataFrame(_cast_floats(columns, precision), copy=False)
 
-    independent_vars = result.model.independent_vars
-    if len(independent_vars) == 1:
-        independent_var = independent_vars[0]
-    else:
-        msg = ('Only 1 independent variable is currently supported.\n'
-               'Found independent variables: %s' % str(independent_vars))
-        raise NotImplementedError(msg)
 
-    x_array = result.userkws[independent_var]
-    d.loc[:, 'x'] = x_array
+def _augment_lmfit_columns(result):
+    """Return the columns of :func:`_augment_lmfit_modelresult`.
+    """
+    columns = _independent_var_columns(result)
+    for col in ('data', 'best_fit', 'residual'):
+        columns[col] = np.ravel(getattr(result, col))
+
+    components = result.components
+    if len(components) > 1:
+        # Evaluate all the components in one pass on the raw arrays
+        comp_values = _profiled_call('evaluate', result.eval_components)
+        if len(comp_values) != len(components):
+            # Components with duplicated prefixes, evaluate one by one
+            comp_values = [comp.eval(params=result.params, **result.userkws)
+                           for comp in components]
+        else:
+            comp_values = comp_values.values()
+        shape = np.shape(result.data)
+        for comp, values in zip(components, comp_values):
+            columns[comp.name] = np.ravel(np.broadcast_to(values, shape))
+    return columns
+
+
+def _cast_floats(columns, precision):
+    """Return a copy of `columns` with float arrays cast to `precision`.
+
+    If `precision` is None, `columns` is returned unchanged.
+    """
+    if precision is None:
+        return columns
+    return OrderedDict(
+        (name, values.astype(precision, copy=False)
+         if np.issubdtype(values.dtype, np.floating) else values)
+        for name, values in columns.items())
+
 
-    if len(result.components) > 1:
-        comp_names = [c.name for c in result.components]
-        for cname, comp in zip(comp_names, result.components):
-            d.loc[:, cname] = comp.eval(x=d.x, **result.values)
-    return d.apply(pd.to_numeric, errors='ignore')
+def _independent_var_columns(result):
+    """Return an OrderedDict of independent variables arrays for `result`.
+    """
+    ndata = np.size(result.data)
+    independent_vars = OrderedDict()
+    for name in result.model.independent_vars:
+        value = result.userkws.get(name)
+        if value is not None and np.ndim(value) > 0 and \
+                np.size(value) == ndata:
+            independent_vars[name] = np.ravel(value)
+    if len(result.model.independent_vars) == 1 and independent_vars:
+        independent_vars = OrderedDict(x=independent_vars.popitem()[1])
+    return independent_vars
 
 
 def tidy_to_dict(df, key='name', value='value', keys_exclude=None,
@@ -506,23 +3156,165 @@ def tidy_to_dict(df, key='name', value='value', keys_exclude=None,
             the returned dictionary.
         cast_value (callable or None): callable used to cast
             the value of each item in the dictionary. If None, no casting
-            is performed and the resulting values are 1-element
-            `pandas.Series`. Default is the python built-in `float`.
+            is performed and the resulting values are the scalars
+            in the `value` column. Default is the python built-in `float`.
             Other typical values may be `int` or `str`.
 
     Returns:
         A dictionary with keys and values extracted from the input (tidy)
         DataFrame.
 
-    See also: :func:`dict_to_tidy`.
+    See also: :func:`dict_to_tidy`, :func:`tidy_to_dict_grouped`.
     """
-    keys_list = set(df[key])
-    if keys_exclude is not None:
-        keys_list = keys_list - set(keys_exclude)
+    if df[key].duplicated().any():
+        msg = ('Column `%s` contains duplicated keys. To convert a DataFrame '
+               'with multiple fit results use `tidy_to_dict_grouped`.')
+        raise ValueError(msg % key)
+    return _rows_to_dict(df[key].tolist(), df[value].tolist(), keys_exclude,
+                         cast_value)
+
+
+def tidy_to_dict_grouped(df, var_names='key', key='name', value='value',
+                         keys_exclude=None, cast_value=float):
+    """Convert a tidy DataFrame with multiple fit results into dictionaries.
+
+    This is the equivalent of calling :func:`tidy_to_dict` on the rows of
+    each fit result, where fit results are identified by the values in the
+    "key" columns `var_names` (as returned by :func:`tidy`). All the
+    dictionaries are built in a single pass on the DataFrame.
+
+    Example:
+        Build a dict of parameters for each fit in a dict of lists::
+
+            >>> dft = br.tidy(results, var_names=['function', 'dataset'])
+            >>> params = br.tidy_to_dict_grouped(
+            ...     dft, var_names=['function', 'dataset'])
+            >>> params['A', 0]
+            {'amplitude': 1.02, 'center': 0.98, 'sigma': 0.51}
+
+    Arguments:
+        df (pandas.DataFrame): the "tidy" DataFrame containing the data.
+        var_names (string or list): name(s) of the column(s) identifying
+            each fit result.
+        key (string or scalar): name of the DataFrame column containing
+            the keys of the dictionaries.
+        value (string or scalar ): name of the DataFrame column containing
+            the values of the dictionaries.
+        keys_exclude (iterable or None): list of keys excluded when building
+            the returned dictionaries.
+        cast_value (callable or None): callable used to cast the values.
+            See :func:`tidy_to_dict`.
+
+    Returns:
+        A dictionary of dictionaries. Keys of the outer dictionary are the
+        values in the column `var_names` when it is a string, otherwise
+        tuples of values in the columns `var_names`. The inner dictionaries
+        are built as in :func:`tidy_to_dict`.
+
+    See also: :func:`tidy_to_dict`.
+    """
+    var_names_list = _as_list_of_strings_copy(var_names)
+    if df.duplicated(var_names_list + [key]).any():
+        msg = 'Column `%s` contains duplicated keys for the same fit result.'
+        raise ValueError(msg % key)
+    groups = _group_keys(df, var_names)
+    rows = OrderedDict()
+    for group, k, v in zip(groups, df[key].tolist(), df[value].tolist()):
+        group_rows = rows.setdefault(group, ([], []))
+        group_rows[0].append(k)
+        group_rows[1].append(v)
+    return {group: _rows_to_dict(keys, values, keys_exclude, cast_value)
+            for group, (keys, values) in rows.items()}
+
+
+def tidy_to_params(df, var_names=None, value='value', nested=False):
+    """Build `lmfit.Parameters` from a tidy DataFrame of fitted parameters.
+
+    This is the inverse of :func:`tidy` for lmfit fit results. Parameters
+    are rebuilt from the columns `name`, `value` (or the column passed in
+    `value`), `min`, `max`, `vary` and `expr`. Missing `min`/`max`, `vary`
+    or `expr` columns default to no bounds, varied parameters and no
+    constraints. A typical use-case is to warm-start a batch of fits
+    with the results of a previous batch::
+
+        >>> dft = br.tidy(results, var_names='dataset')
+        >>> params = br.tidy_to_params(dft, var_names='dataset')
+        >>> new_results = [model.fit(y, params[i], x=x)
+        ...                for i, y in enumerate(datasets)]
+
+    Arguments:
+        df (pandas.DataFrame): tidy DataFrame as returned by :func:`tidy`.
+        var_names (string, list or None): name(s) of the column(s)
+            identifying each fit result. If None, `df` contains the
+            parameters of a single fit result.
+        value (string): name of the column containing the parameters'
+            values. Use 'init_value' to get the initial values of the fit.
+        nested (bool): if True and `var_names` is a list, return
+            nested dicts (one nesting level for each column in
+            `var_names`) instead of a dict with tuple keys.
+
+    Returns:
+        A `lmfit.Parameters` object if `var_names` is None. Otherwise
+        a dict of `lmfit.Parameters` with keys as in
+        :func:`tidy_to_dict_grouped` (or nested dicts, see `nested`).
+    """
+    num_rows = len(df)
+
+    def column(name, default):
+        if name not in df:
+            return [default] * num_rows
+        return df[name].tolist()
+    names = df['name'].tolist()
+    values = _float_array(df[value].tolist()).tolist()
+    mins = np.nan_to_num(_float_array(column('min', -np.inf)), nan=-np.inf,
+                         posinf=np.inf, neginf=-np.inf).tolist()
+    maxs = np.nan_to_num(_float_array(column('max', np.inf)), nan=np.inf,
+                         posinf=np.inf, neginf=-np.inf).tolist()
+    varies = column('vary', True)
+    exprs = [expr if isinstance(expr, str) and expr else None
+             for expr in column('expr', None)]
+    rows = zip(names, values, varies, mins, maxs, exprs)
+    if var_names is None:
+        params = lmfit.Parameters()
+        params.add_many(*rows)
+        return params
+
+    groups = OrderedDict()
+    for group, row in zip(_group_keys(df, var_names), rows):
+        groups.setdefault(group, []).append(row)
+    out = OrderedDict()
+    for group, group_rows in groups.items():
+        params = lmfit.Parameters()
+        params.add_many(*group_rows)
+        if nested and not isinstance(var_names, str):
+            parent = out
+            for k in group[:-1]:
+                parent = parent.setdefault(k, OrderedDict())
+            parent[group[-1]] = params
+        else:
+            out[group] = params
+    return out
+
+
+def _group_keys(df, var_names):
+    """Return a list with the group key of each row of `df`.
+
+    The group key is the value of the column `var_names` when it is a
+    string, otherwise the tuple of values in the columns `var_names`.
+    """
+    if isinstance(var_names, str):
+        return df[var_names].tolist()
+    return list(zip(*[df[name].tolist() for name in var_names]))
+
+
+def _rows_to_dict(keys, values, keys_exclude, cast_value):
+    """Build a dict from the lists `keys` and `values` (see `tidy_to_dict`).
+    """
+    exclude = set() if keys_exclude is None else set(keys_exclude)
     if cast_value is None:
-        cast_value = lambda x: x
-    return {var: cast_value(df.loc[df[key] == var, value])
-            for var in keys_list}
+        return {k: v for k, v in zip(keys, values) if k not in exclude}
+    return {k: cast_value(v) for k, v in zip(keys, values)
+            if k not in exclude}
 
 
 def dict_to_tidy(dc, key='name', value='value', keys_exclude=None):
@@ -552,10 +3344,8 @@ def dict_to_tidy(dc, key='name', value='value', keys_exclude=None):
     if keys_exclude is not None:
         keys -= keys_exclude
     keys = sorted(keys)
-    df = pd.DataFrame(columns=(key, value), index=range(len(keys)))
-    df[key] = keys
-    df[value] = [dc[k] for k in keys]
-    return df
+    columns = OrderedDict([(key, keys), (value, [dc[k] for k in keys])])
+    return pd.DataFrame(columns)
 
 
 def _test_dict_to_tidy(dc, key='name', value='value', keys_exclude=None,
@@ -571,3 +3361,56 @@ def _test_dict_to_tidy(dc, key='name', value='value', keys_exclude=None,
     # Test compliance
     assert all(df == dict_to_tidy(dc, key, value, keys_exclude, value_type))
     return df
+
+
+# Built-in tidying functions, see `register`
+
+def _tidy_scipy(result, **kwargs):
+    if 'param_names' not in kwargs:
+        msg = "The argument `param_names` is required for this input type."
+        raise ValueError(msg)
+    return tidy_scipy_result(result, **kwargs)
+
+
+def _tidy_lmfit(result, **kwargs):
+    return tidy_lmfit_result(result)
+
+
+def _glance_lmfit(result, **kwargs):
+    return glance_lmfit_result(result)
+
+
+def _augment_lmfit(result, precision=None, **kwargs):
+    return _augment_lmfit_modelresult(result, precision=precision)
+
+
+_lmfit_result_types = (lmfit.model.ModelResult,
+                       lmfit.minimizer.MinimizerResult)
+register('tidy', so.OptimizeResult, _tidy_scipy)
+register('tidy', _lmfit_result_types, _tidy_lmfit)
+register('glance', so.OptimizeResult, glance_scipy_result)
+register('glance', _lmfit_result_types, _glance_lmfit)
+register('augment', lmfit.model.ModelResult, _augment_lmfit)
+
+
+def _tidy_snapshot(result, **kwargs):
+    if result.result_type == 'OptimizeResult':
+        return _tidy_scipy(so.OptimizeResult(result.tidy_data), **kwargs)
+    return pd.DataFrame(result.tidy_data)
+
+
+def _glance_snapshot(result, **kwargs):
+    return _one_row_frame(result.glance_data)
+
+
+def _augment_snapshot(result, precision=None, **kwargs):
+    if result.augment_data is None:
+        msg = ('No `augment` data in the snapshot of a %s. Use '
+               '`snapshot(..., augment=True)` with `lmfit.ModelResult`.')
+        raise ValueError(msg % result.result_type)
+    return pd.DataFrame(_cast_floats(result.augment_data, precision))
+
+
+register('tidy', ResultSnapshot, _tidy_snapshot)
+register('glance', ResultSnapshot, _glance_snapshot)
+register('augment', ResultSnapshot, _augment_snapshot)